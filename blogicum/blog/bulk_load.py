@@ -0,0 +1,163 @@
+import json
+from collections import defaultdict
+
+from django.core.management.color import no_style
+from django.core.serializers.python import Deserializer
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import feed, page_cache, publication, search
+from .models import Post, make_excerpt
+
+BATCH_SIZE = 1000
+BLOCK_SIZE = 1 << 16
+SEPARATORS = ' \t\r\n,[]'
+
+
+def iter_objects(stream, block_size=BLOCK_SIZE):
+    """Объекты фикстуры по одному, без чтения файла целиком в память.
+
+    Понимает и JSON-массив, как в db.json, и JSON Lines.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    exhausted = False
+    while True:
+        while position < len(buffer) and buffer[position] in SEPARATORS:
+            position += 1
+        if position < len(buffer):
+            try:
+                obj, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+            else:
+                yield obj
+                continue
+        elif exhausted:
+            return
+        block = stream.read(block_size)
+        exhausted = not block
+        buffer = buffer[position:] + block
+        position = 0
+
+
+def insert(model, objs):
+    """Вставляет объекты с заданными id многострочными INSERT.
+
+    Это те же пачки, что у bulk_create, но в режиме raw, как у loaddata:
+    иначе auto_now_add затёр бы даты, заданные в самих объектах.
+    """
+    fields = model._meta.concrete_fields
+    size = max(connection.ops.bulk_batch_size(fields, objs), 1)
+    for start in range(0, len(objs), size):
+        model._base_manager._insert(
+            objs[start:start + size], fields=fields, raw=True
+        )
+
+
+def _prepare(obj):
+    for field in obj._meta.concrete_fields:
+        auto = getattr(field, 'auto_now', False) or getattr(
+            field, 'auto_now_add', False
+        )
+        if auto and getattr(obj, field.attname) is None:
+            setattr(obj, field.attname, timezone.now())
+    if isinstance(obj, Post):
+        obj.excerpt = make_excerpt(obj.text)
+
+
+class Loader:
+    """Пакетная вставка десериализованных объектов фикстуры.
+
+    Объекты копятся по моделям. Перед вставкой пачки модели сначала
+    вставляются накопленные пачки моделей, на которые она ссылается,
+    поэтому при обычном порядке фикстуры внешние ключи уже на месте.
+    """
+
+    def __init__(self, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.pending = defaultdict(list)
+        self.links = defaultdict(list)
+        self.loaded = defaultdict(int)
+        self.skipped = defaultdict(int)
+
+    def add(self, deserialized):
+        obj = deserialized.object
+        model = obj._meta.concrete_model
+        _prepare(obj)
+        self.pending[model].append(obj)
+        for name, pks in (deserialized.m2m_data or {}).items():
+            field = model._meta.get_field(name)
+            through = field.remote_field.through
+            for pk in pks:
+                self.links[through].append(through(**{
+                    field.m2m_field_name(): obj.pk,
+                    field.m2m_reverse_field_name(): pk,
+                }))
+        if len(self.pending[model]) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model, seen=()):
+        seen = {*seen, model}
+        for field in model._meta.concrete_fields:
+            target = field.related_model
+            if target is not None and target not in seen:
+                target = target._meta.concrete_model
+                if self.pending.get(target):
+                    self.flush(target, seen)
+        objs = self.pending.pop(model, [])
+        if not objs:
+            return
+        existing = set(model._base_manager.filter(
+            pk__in=[obj.pk for obj in objs]
+        ).values_list('pk', flat=True))
+        fresh = [obj for obj in objs if obj.pk not in existing]
+        self.skipped[model] += len(objs) - len(fresh)
+        insert(model, fresh)
+        self.loaded[model] += len(fresh)
+
+    def finish(self):
+        while self.pending:
+            self.flush(next(iter(self.pending)))
+        for through, rows in self.links.items():
+            through.objects.bulk_create(
+                rows, batch_size=self.batch_size, ignore_conflicts=True
+            )
+        self.links.clear()
+
+
+def load(stream, batch_size=BATCH_SIZE):
+    """Загружает фикстуру в одной транзакции и проверяет ключи в конце."""
+    loader = Loader(batch_size)
+    with transaction.atomic():
+        with connection.constraint_checks_disabled():
+            for deserialized in Deserializer(
+                    iter_objects(stream), ignorenonexistent=True
+            ):
+                loader.add(deserialized)
+            loader.finish()
+        models = set(loader.loaded)
+        connection.check_constraints(
+            table_names=[model._meta.db_table for model in models]
+        )
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), list(models)
+        )
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+    return loader
+
+
+def rebuild_derived(recount=True):
+    """Пересчитывает данные, которые вставка в обход save() не обновила."""
+    if recount:
+        Post.objects.recount_comments()
+    publication.reset()
+    feed.rebuild()
+    for _ in search.reindex():
+        pass
+    page_cache.bump_generation()
@@ -0,0 +1,44 @@
+from django.db.models import Q
+
+from . import links
+from .models import Comment
+from .paginators import CursorPaginator
+
+COUNT_OF_COMMENTS = 20
+
+
+def post_comments(post_id):
+    return Comment.objects.select_related('author').filter(
+        post__id=post_id).order_by('created_at', 'pk')
+
+
+def comments_page(post_id, cursor=None):
+    """Порция комментариев после курсора, по COUNT_OF_COMMENTS штук."""
+    paginator = CursorPaginator(post_comments(post_id), COUNT_OF_COMMENTS)
+    return paginator.page(cursor)
+
+
+def comment_page_url(comment, anchor=True, removed=False):
+    """Адрес страницы публикации с той порцией, где стоит комментарий.
+
+    Порции выровнены так же, как при подгрузке, поэтому курсор берётся
+    от последнего комментария предыдущей порции. Для удаляемого
+    комментария (removed), открывавшего порцию, берётся предыдущая:
+    после удаления его порция может оказаться пустой.
+    """
+    url = links.url('blog:post_detail', post_id=comment.post_id)
+    comments = post_comments(comment.post_id)
+    before = comments.filter(
+        Q(created_at__lt=comment.created_at) | Q(pk__lt=comment.pk),
+        created_at__lte=comment.created_at,
+    ).count()
+    chunk = (before - 1 if removed and before else before) // COUNT_OF_COMMENTS
+    if chunk:
+        previous = comments[chunk * COUNT_OF_COMMENTS - 1]
+        cursor = CursorPaginator(comments, COUNT_OF_COMMENTS).cursor_for(
+            previous
+        )
+        url = f'{url}?comments={cursor}'
+    if anchor:
+        url = f'{url}#comment_{comment.pk}'
+    return url
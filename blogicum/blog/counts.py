@@ -0,0 +1,58 @@
+import time
+from hashlib import md5
+
+from django.core.cache import cache
+
+from core import metrics
+
+from . import tasks
+
+COUNT_TTL = 60
+COUNT_TIMEOUT = 60 * 60 * 24
+LOCK_TIMEOUT = 60
+ESTIMATE_LIMIT = 1000
+
+
+def count_key(name):
+    return f'blog:count:{md5(name.encode()).hexdigest()}'
+
+
+def queryset_key(name, queryset):
+    """Ключ счётчика списка: адрес и текст SQL без параметров.
+
+    Один адрес может отдавать разные выборки (профиль владельцу и
+    гостям), а параметры содержат текущее время и меняются каждый раз.
+    """
+    sql, _ = queryset.query.sql_with_params()
+    return count_key(f'{name}\n{sql}')
+
+
+def refresh(key, queryset):
+    """Точный пересчёт; выполняется вне обработки запроса."""
+    try:
+        cache.set(key, (queryset.order_by().count(), time.time()),
+                  COUNT_TIMEOUT)
+    finally:
+        cache.delete(f'{key}:lock')
+
+
+def schedule_refresh(key, queryset):
+    if cache.add(f'{key}:lock', True, LOCK_TIMEOUT):
+        tasks.run(refresh, key, queryset)
+
+
+def approximate(key, queryset):
+    """Число строк запроса без точного COUNT(*) на пути запроса.
+
+    Берётся сохранённое значение, устаревшее пересчитывается в фоне.
+    Пока значения нет, считаются только первые ESTIMATE_LIMIT строк.
+    """
+    cached = cache.get(key)
+    metrics.cache_lookup('count', cached is not None)
+    if cached is not None:
+        total, counted_at = cached
+        if time.time() - counted_at > COUNT_TTL:
+            schedule_refresh(key, queryset)
+        return total
+    schedule_refresh(key, queryset)
+    return queryset.order_by()[:ESTIMATE_LIMIT].count()
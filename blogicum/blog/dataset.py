@@ -0,0 +1,195 @@
+import random
+from array import array
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+from . import bulk_load
+from .models import Category, Comment, Location, Post, User, make_excerpt
+
+BATCH_SIZE = 5000
+SENTENCES = 2000
+HISTORY = timedelta(days=3 * 365)
+SCHEDULE = timedelta(days=30)
+LOCATION_SHARE = 0.7
+HIDDEN_CATEGORY_SHARE = 0.1
+PASSWORD = 'blogicum'
+PASSWORD_SALT = 'syntheticdata'
+
+
+class Generator:
+    """Детерминированный по seed генератор данных блога.
+
+    Популярность авторов и публикаций распределена по Ципфу с
+    показателем skew: немногие публикации собирают большую часть
+    комментариев. Отложенные публикации комментариев не получают.
+    Даты отсчитываются от начала текущих суток, поэтому запуски в один
+    день дают одинаковые данные.
+    """
+
+    def __init__(self, seed=0, skew=1.1, future_share=0.05,
+                 unpublished_share=0.05, batch_size=BATCH_SIZE):
+        self.random = random.Random(seed)
+        self.faker = Faker('ru_RU')
+        self.faker.seed_instance(seed)
+        self.skew = skew
+        self.future_share = future_share
+        self.unpublished_share = unpublished_share
+        self.batch_size = batch_size
+        self.now = timezone.now().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self.sentences = [
+            self.faker.sentence(nb_words=12) for _ in range(SENTENCES)
+        ]
+
+    def _zipf(self, count):
+        """Накопленные веса Ципфа для count объектов в случайном порядке."""
+        ranks = list(range(1, count + 1))
+        self.random.shuffle(ranks)
+        return array('d', accumulate(rank ** -self.skew for rank in ranks))
+
+    def _text(self, low, high):
+        size = self.random.randint(low, high)
+        return ' '.join(self.random.choices(self.sentences, k=size))
+
+    def _past(self):
+        return self.now - HISTORY * self.random.random()
+
+    def _insert(self, model, objs):
+        """Вставляет объекты пачками, каждая в своей транзакции."""
+        objs = iter(objs)
+        while batch := list(islice(objs, self.batch_size)):
+            with transaction.atomic():
+                bulk_load.insert(model, batch)
+
+    def _ids(self, model, count):
+        first = (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        return range(first, first + count)
+
+    def users(self, count):
+        password = make_password(PASSWORD, salt=PASSWORD_SALT)
+        ids = self._ids(User, count)
+        self._insert(User, (
+            User(
+                pk=pk, username=f'{self.faker.user_name()}{pk}',
+                first_name=self.faker.first_name(),
+                last_name=self.faker.last_name(),
+                email=f'user{pk}@example.com', password=password,
+                date_joined=self._past(),
+            )
+            for pk in ids
+        ))
+        return ids
+
+    def categories(self, count):
+        ids = self._ids(Category, count)
+        self._insert(Category, (
+            Category(
+                pk=pk, title=self.faker.word().capitalize(),
+                description=self._text(1, 3), slug=f'category-{pk}',
+                is_published=self.random.random() >= HIDDEN_CATEGORY_SHARE,
+                created_at=self._past(), updated_at=self.now,
+            )
+            for pk in ids
+        ))
+        return ids
+
+    def locations(self, count):
+        ids = self._ids(Location, count)
+        self._insert(Location, (
+            Location(
+                pk=pk, name=self.faker.city(), created_at=self._past(),
+                updated_at=self.now,
+            )
+            for pk in ids
+        ))
+        return ids
+
+    def _schedule(self, count):
+        """Даты публикаций (timestamp) и счётчики комментариев к ним."""
+        pub_dates = array('d')
+        for _ in range(count):
+            if self.random.random() < self.future_share:
+                moment = self.now + SCHEDULE * self.random.random()
+            else:
+                moment = self._past()
+            pub_dates.append(moment.timestamp())
+        return pub_dates
+
+    def _comment_counts(self, count, comments, pub_dates):
+        popularity = self._zipf(count)
+        counts = array('I', bytes(4 * count))
+        now = self.now.timestamp()
+        remaining = comments
+        while remaining:
+            batch = min(remaining, self.batch_size)
+            for index in self.random.choices(
+                    range(count), cum_weights=popularity, k=batch
+            ):
+                if pub_dates[index] < now:
+                    counts[index] += 1
+            remaining -= batch
+        return counts
+
+    def _moment(self, timestamp):
+        return datetime.fromtimestamp(timestamp, timezone.utc)
+
+    def posts(self, count, comments, authors, categories, locations):
+        """Создаёт публикации и комментарии; возвращает число комментариев."""
+        ids = self._ids(Post, count)
+        author_weights = self._zipf(len(authors))
+        pub_dates = self._schedule(count)
+        comment_counts = self._comment_counts(count, comments, pub_dates)
+
+        def make_post(index, pk):
+            text = self._text(1, 12)
+            moment = self._moment(pub_dates[index])
+            return Post(
+                pk=pk,
+                title=self.random.choice(self.sentences)[:60],
+                text=text,
+                excerpt=make_excerpt(text),
+                pub_date=moment,
+                author_id=self.random.choices(
+                    authors, cum_weights=author_weights
+                )[0],
+                category_id=self.random.choice(categories),
+                location_id=(
+                    self.random.choice(locations)
+                    if locations and self.random.random() < LOCATION_SHARE
+                    else None
+                ),
+                is_published=self.random.random() >= self.unpublished_share,
+                comment_count=comment_counts[index],
+                created_at=min(moment, self.now),
+                updated_at=self.now,
+            )
+
+        self._insert(Post, (
+            make_post(index, pk) for index, pk in enumerate(ids)
+        ))
+        self._insert(Comment, self._comments(
+            ids, comment_counts, pub_dates, authors
+        ))
+        return sum(comment_counts)
+
+    def _comments(self, post_ids, comment_counts, pub_dates, authors):
+        comment_ids = iter(self._ids(Comment, sum(comment_counts)))
+        for index, total in enumerate(comment_counts):
+            published = self._moment(pub_dates[index])
+            age = (self.now - published).total_seconds()
+            for _ in range(total):
+                yield Comment(
+                    pk=next(comment_ids), post_id=post_ids[index],
+                    author_id=self.random.choice(authors),
+                    text=self._text(1, 3),
+                    created_at=published + timedelta(
+                        seconds=age * self.random.random()
+                    ),
+                )
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.encoding import is_protected_type
+
+from .models import Category, Comment, Location, Post, User
+
+EXPORT_MODELS = (User, Category, Location, Post, Comment)
+CHUNK_SIZE = 2000
+
+
+class ExportEncoder(DjangoJSONEncoder):
+    """Как у dumpdata, но время пишется с микросекундами."""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _value(obj, field):
+    if field.remote_field is not None:
+        return getattr(obj, field.attname)
+    value = field.value_from_object(obj)
+    if is_protected_type(value):
+        return value
+    return field.value_to_string(obj)
+
+
+def _many_to_many(model, pks):
+    """Связи многие-ко-многим для порции объектов одним запросом на поле."""
+    related = {}
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+        if not through._meta.auto_created:
+            continue
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        links = {pk: [] for pk in pks}
+        for pk, target_pk in through.objects.filter(
+                **{f'{source}__in': pks}
+        ).order_by(source, target).values_list(source, target).iterator():
+            links[pk].append(target_pk)
+        related[field.name] = links
+    return related
+
+
+def rows(model, after=0, chunk_size=CHUNK_SIZE):
+    """Записи модели в формате dumpdata, порциями по возрастанию pk.
+
+    Каждая порция — диапазон по первичному ключу от последнего
+    выгруженного pk, читаемый через iterator(), поэтому в памяти
+    держится не больше одной порции.
+    """
+    fields = [
+        field for field in model._meta.local_concrete_fields
+        if not field.primary_key
+    ]
+    label = model._meta.label_lower
+    while True:
+        chunk = list(
+            model.objects.filter(pk__gt=after).order_by('pk')[:chunk_size]
+            .iterator(chunk_size=chunk_size)
+        )
+        if not chunk:
+            return
+        related = _many_to_many(model, [obj.pk for obj in chunk])
+        for obj in chunk:
+            data = {field.name: _value(obj, field) for field in fields}
+            for name, links in related.items():
+                data[name] = links[obj.pk]
+            yield {'model': label, 'pk': obj.pk, 'fields': data}
+        after = chunk[-1].pk
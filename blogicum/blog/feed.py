@@ -0,0 +1,69 @@
+from itertools import islice
+
+from django.db import transaction
+
+from . import publication
+from .models import FeedEntry, Post
+
+BATCH_SIZE = 1000
+
+
+def _entries(posts):
+    return (
+        FeedEntry(
+            post_id=pk,
+            pub_date=pub_date,
+            category_id=category_id,
+            author_id=author_id,
+        )
+        for pk, pub_date, category_id, author_id in posts.values_list(
+            'pk', 'pub_date', 'category_id', 'author_id'
+        ).iterator(chunk_size=BATCH_SIZE)
+    )
+
+
+def _insert(posts):
+    entries = _entries(posts)
+    while batch := list(islice(entries, BATCH_SIZE)):
+        FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def sync_post(post):
+    """Приводит запись ленты в соответствие с сохранённой публикацией."""
+    if publication.is_visible(post):
+        FeedEntry.objects.update_or_create(
+            post_id=post.pk,
+            defaults={
+                'pub_date': post.pub_date,
+                'category_id': post.category_id,
+                'author_id': post.author_id,
+            }
+        )
+    else:
+        FeedEntry.objects.filter(post_id=post.pk).delete()
+
+
+def sync_category(category):
+    if category.is_published:
+        _insert(Post.objects.filter(
+            category=category, **publication.visible_filter()
+        ))
+    else:
+        FeedEntry.objects.filter(category=category).delete()
+
+
+def promote(since=None, until=None):
+    """Добавляет в ленту публикации, дата которых наступила."""
+    posts = Post.objects.filter(**publication.visible_filter(until))
+    if since is not None:
+        posts = posts.filter(pub_date__gte=since)
+    else:
+        posts = posts.filter(feed_entry__isnull=True)
+    _insert(posts)
+
+
+@transaction.atomic
+def rebuild():
+    FeedEntry.objects.all().delete()
+    _insert(Post.objects.filter(**publication.visible_filter()))
+    return FeedEntry.objects.count()
@@ -0,0 +1,113 @@
+import time
+
+from django.core.cache import cache
+from django.template import Context
+from django.template.loader import get_template
+
+from core import metrics
+
+from .models import Category, Location, Post, User
+
+CARD_TEMPLATE = 'includes/post_card.html'
+CARD_TIMEOUT = 60 * 60 * 24
+
+
+def _version_key(label, pk):
+    return f'blog:version:{label}:{pk}'
+
+
+def bump_version(label, pk):
+    key = _version_key(label, pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), None)
+
+
+def bump(instance):
+    """Инвалидирует закешированные фрагменты, зависящие от объекта."""
+    bump_version(instance._meta.label_lower, instance.pk)
+
+
+def versions(dependencies):
+    """Текущие версии пар (метка, pk); отсутствующие заводятся заново.
+
+    Начальное значение — время в наносекундах, поэтому версия,
+    вытесненная из кеша, не совпадёт ни с одной выданной раньше.
+    """
+    keys = [_version_key(label, pk) for label, pk in dependencies]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            initial = time.time_ns()
+            if not cache.add(key, initial, None):
+                initial = cache.get(key, initial)
+            found[key] = initial
+    return [found[key] for key in keys]
+
+
+def _card_dependencies(post):
+    return (
+        (Post._meta.label_lower, post.pk),
+        (Category._meta.label_lower, post.category_id),
+        (Location._meta.label_lower, post.location_id),
+        (User._meta.label_lower, post.author_id),
+    )
+
+
+def _card_key(post, card_versions):
+    version = '.'.join(str(v) for v in card_versions)
+    return f'blog:card:{post.pk}:{version}:{post.comment_count}'
+
+
+def card_key(post):
+    """Ключ карточки: id публикации и версии всего, что в ней выводится.
+
+    Счётчик комментариев входит в ключ напрямую, он хранится в строке
+    публикации.
+    """
+    return _card_key(post, versions(_card_dependencies(post)))
+
+
+def card_keys(posts):
+    """Ключи карточек страницы; версии читаются одним get_many."""
+    dependencies = {
+        pair: None for post in posts for pair in _card_dependencies(post)
+    }
+    found = dict(zip(dependencies, versions(dependencies)))
+    return [
+        _card_key(post, [found[pair] for pair in _card_dependencies(post)])
+        for post in posts
+    ]
+
+
+def render_cards(posts):
+    """HTML карточек страницы в порядке posts.
+
+    Кеш читается и пополняется одним обращением на страницу, а
+    недостающие карточки отрисовываются в одном контексте, без
+    повторного поиска шаблона для каждой.
+    """
+    posts = list(posts)
+    keys = card_keys(posts)
+    found = cache.get_many(keys)
+    missing = {}
+    context = None
+    for post, key in zip(posts, keys):
+        metrics.cache_lookup('card', key in found)
+        if key in found or key in missing:
+            continue
+        if context is None:
+            template = get_template(CARD_TEMPLATE).template
+            context = Context(autoescape=template.engine.autoescape)
+        with context.push(post=post):
+            missing[key] = template.render(context)
+    if missing:
+        cache.set_many(missing, CARD_TIMEOUT)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def render_card(post):
+    html, = render_cards([post])
+    return html
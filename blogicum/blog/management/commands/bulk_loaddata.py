@@ -0,0 +1,42 @@
+import gzip
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+from django.db import IntegrityError
+
+from blog import bulk_load
+
+
+class Command(BaseCommand):
+    help = (
+        'Быстро загружает фикстуру в формате db.json или JSON Lines:'
+        ' читает файл потоком и вставляет записи пачками. Записи с уже'
+        ' существующим id пропускаются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'fixture', help='Путь к файлу (.json, .jsonl, .gz).'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=bulk_load.BATCH_SIZE,
+            help='Сколько записей одной модели вставлять за раз.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['fixture']
+        opener = gzip.open if path.endswith('.gz') else open
+        try:
+            with opener(path, 'rt', encoding='utf-8') as stream:
+                loader = bulk_load.load(stream, options['batch_size'])
+        except (OSError, ValueError, DeserializationError,
+                IntegrityError) as error:
+            raise CommandError(f'Не удалось загрузить {path}: {error}')
+        for model, total in loader.loaded.items():
+            skipped = loader.skipped[model]
+            self.stdout.write(
+                f'{model._meta.label_lower}: загружено {total},'
+                f' пропущено {skipped}'
+            )
+        bulk_load.rebuild_derived()
+        self.stdout.write('Счётчики, лента и поисковый индекс пересчитаны.')
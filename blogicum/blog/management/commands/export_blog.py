@@ -0,0 +1,86 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import export
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает пользователей, категории, местоположения, публикации и'
+        ' комментарии в формате JSON Lines, порциями, без загрузки всей'
+        ' базы в память.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output', help='Файл для выгрузки; «-» — стандартный вывод.'
+        )
+        parser.add_argument(
+            '--gzip', action='store_true',
+            help='Сжимать выгрузку (включается и по расширению .gz).'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=export.CHUNK_SIZE,
+            help='Сколько записей читать из БД за один запрос.'
+        )
+        parser.add_argument(
+            '--resume', metavar='MODEL:ID',
+            help=(
+                'Продолжить прерванную выгрузку: дописать в файл записи'
+                ' модели (например, blog.post) с id больше указанного и'
+                ' все следующие модели.'
+            )
+        )
+
+    def _resume_point(self, resume):
+        labels = [model._meta.label_lower for model in export.EXPORT_MODELS]
+        if resume is None:
+            return labels[0], 0
+        label, _, pk = resume.partition(':')
+        if label not in labels or not pk.isdigit():
+            raise CommandError(
+                f'Неверная точка продолжения {resume!r}: ожидается'
+                f' MODEL:ID, где MODEL одна из {", ".join(labels)}.'
+            )
+        return label, int(pk)
+
+    def _open(self, output, compress, append):
+        mode = 'at' if append else 'wt'
+        if output == '-':
+            if compress:
+                raise CommandError('Сжатая выгрузка пишется только в файл.')
+            return sys.stdout
+        if compress:
+            return gzip.open(output, mode, encoding='utf-8')
+        return open(output, mode, encoding='utf-8')
+
+    def handle(self, *args, **options):
+        output = options['output']
+        compress = options['gzip'] or output.endswith('.gz')
+        start_label, after = self._resume_point(options['resume'])
+        encoder = export.ExportEncoder(ensure_ascii=False)
+        stream = self._open(output, compress, options['resume'] is not None)
+        started = False
+        try:
+            for model in export.EXPORT_MODELS:
+                label = model._meta.label_lower
+                started = started or label == start_label
+                if not started:
+                    continue
+                total = 0
+                for row in export.rows(
+                        model,
+                        after if label == start_label else 0,
+                        options['chunk_size']
+                ):
+                    stream.write(encoder.encode(row))
+                    stream.write('\n')
+                    total += 1
+                    if total % options['chunk_size'] == 0:
+                        self.stderr.write(f'{label}:{row["pk"]}')
+                self.stderr.write(f'{label}: выгружено записей {total}')
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
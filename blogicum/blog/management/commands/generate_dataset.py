@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import bulk_load, dataset
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует синтетические данные блога заданного объёма для'
+        ' нагрузочных замеров. Одинаковый --seed даёт одинаковые данные.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--comments', type=int, default=1_000_000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--skew', type=float, default=1.1,
+            help='Показатель распределения Ципфа для популярности.'
+        )
+        parser.add_argument(
+            '--future-share', type=float, default=0.05,
+            help='Доля отложенных публикаций.'
+        )
+        parser.add_argument(
+            '--unpublished-share', type=float, default=0.05,
+            help='Доля снятых с публикации постов.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=dataset.BATCH_SIZE,
+            help='Сколько записей вставлять в одной транзакции.'
+        )
+
+    def handle(self, *args, **options):
+        if min(options['users'], options['categories']) < 1:
+            raise CommandError('Нужен хотя бы один автор и одна категория.')
+        generator = dataset.Generator(
+            seed=options['seed'],
+            skew=options['skew'],
+            future_share=options['future_share'],
+            unpublished_share=options['unpublished_share'],
+            batch_size=options['batch_size'],
+        )
+        users = generator.users(options['users'])
+        categories = generator.categories(options['categories'])
+        locations = generator.locations(options['locations'])
+        self.stdout.write(
+            f'Пользователей: {len(users)}, категорий: {len(categories)},'
+            f' местоположений: {len(locations)}'
+        )
+        comments = generator.posts(
+            options['posts'], options['comments'],
+            users, categories, locations
+        )
+        self.stdout.write(
+            f'Публикаций: {options["posts"]}, комментариев: {comments}'
+        )
+        bulk_load.rebuild_derived(recount=False)
+        self.stdout.write('Лента и поисковый индекс пересобраны.')
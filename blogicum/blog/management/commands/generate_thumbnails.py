@@ -0,0 +1,42 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from blog import thumbnails
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии фото публикаций в пуле процессов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Число процессов; по умолчанию — число ядер.'
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Пересоздать копии и для уже обработанных фото.'
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='')
+        if not options['all']:
+            posts = posts.filter(thumbnail_widths=[])
+        pending = list(posts.order_by('pk').values_list('pk', 'image'))
+        done = 0
+        with ProcessPoolExecutor(options['workers']) as executor:
+            futures = {
+                executor.submit(thumbnails.generate, image): (pk, image)
+                for pk, image in pending
+            }
+            for future in as_completed(futures):
+                pk, image = futures[future]
+                try:
+                    widths = future.result()
+                except (OSError, ValueError) as error:
+                    self.stderr.write(f'{image}: {error}')
+                    continue
+                thumbnails.store(pk, image, widths)
+                done += 1
+        self.stdout.write(f'Обработано фото: {done} из {len(pending)}')
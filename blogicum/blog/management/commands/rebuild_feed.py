@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from blog import feed, publication
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает материализованную ленту видимых публикаций.'
+
+    def handle(self, *args, **options):
+        publication.reset()
+        total = feed.rebuild()
+        self.stdout.write(f'Записей в ленте: {total}')
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = 'Переиндексирует публикации для полнотекстового поиска.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=search.CHUNK_SIZE,
+            help='Сколько публикаций индексировать в одной транзакции.'
+        )
+
+    def handle(self, *args, **options):
+        last = 0
+        for last in search.reindex(options['chunk_size']):
+            self.stdout.write(f'Проиндексированы публикации до id {last}')
+        self.stdout.write(f'Индекс пересобран, последний id: {last}')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики комментариев у публикаций.'
+
+    def handle(self, *args, **options):
+        updated = Post.objects.recount_comments()
+        self.stdout.write(f'Обновлено публикаций: {updated}')
@@ -0,0 +1,66 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def fill_feed(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    posts = Post.objects.filter(
+        pub_date__lt=timezone.now(),
+        is_published=True,
+        category__is_published=True,
+    ).values_list('pk', 'pub_date', 'category_id', 'author_id')
+    FeedEntry.objects.bulk_create(
+        (
+            FeedEntry(
+                post_id=pk,
+                pub_date=pub_date,
+                category_id=category_id,
+                author_id=author_id,
+            )
+            for pk, pub_date, category_id, author_id in posts
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0010_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+                ('author', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Автор публикации')),
+                ('category', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.category', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Лента',
+                'ordering': ('-pub_date', '-post'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['pub_date', 'post'], name='feed_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['category', 'pub_date', 'post'], name='feed_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['author', 'pub_date', 'post'], name='feed_author_idx'),
+        ),
+        migrations.RunPython(fill_feed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:11
+
+from itertools import islice
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+BATCH_SIZE = 1000
+
+
+def fill_excerpt(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.only('pk', 'text').order_by('pk').iterator(
+        chunk_size=BATCH_SIZE
+    )
+    while True:
+        batch = list(islice(posts, BATCH_SIZE))
+        if not batch:
+            break
+        for post in batch:
+            post.excerpt = Truncator(post.text).words(10, truncate=' …')
+        Post.objects.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_feedentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Анонс'),
+        ),
+        migrations.RunPython(fill_excerpt, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:14
+
+import blog.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSearch',
+            fields=[
+                ('post', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('title', blog.models.SearchField(verbose_name='Заголовок')),
+                ('text', blog.models.SearchField(verbose_name='Текст')),
+                ('rank', models.FloatField(verbose_name='Релевантность')),
+            ],
+            options={
+                'verbose_name': 'поисковый индекс',
+                'verbose_name_plural': 'Поисковый индекс',
+                'db_table': 'blog_post_search',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(
+            sql=[
+                "CREATE VIRTUAL TABLE blog_post_search USING fts5("
+                "title, text, tokenize='unicode61 remove_diacritics 2')",
+                "INSERT INTO blog_post_search(rowid, title, text) "
+                "SELECT id, title, text FROM blog_post",
+            ],
+            reverse_sql='DROP TABLE blog_post_search',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_post_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='thumbnail_widths',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='Ширины уменьшенных копий'),
+        ),
+    ]
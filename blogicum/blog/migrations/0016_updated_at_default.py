@@ -0,0 +1,29 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:41
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Изменено'),
+        ),
+        migrations.AlterField(
+            model_name='location',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Изменено'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Изменено'),
+        ),
+    ]
@@ -1,16 +1,57 @@
+from calendar import timegm
+from functools import partial, wraps
+from hashlib import md5
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.urls import reverse
 from django.shortcuts import redirect
 
+from core import metrics
+
+from . import comments, counts, page_cache, tasks, thumbnails
 from .models import Comment
+from .paginators import CursorPaginator, InvalidCursor, WindowedPaginator
+
+
+def memoize_object(get_object):
+    """Кеширует результат get_object() на время запроса.
+
+    Объект хранится в самом запросе, поэтому проверка прав в миксине и
+    обработчик представления получают один и тот же экземпляр.
+    """
+    @wraps(get_object)
+    def wrapper(self, queryset=None):
+        if queryset is not None:
+            return get_object(self, queryset)
+        objects = self.request.__dict__.setdefault('_blog_objects', {})
+        key = (type(self).__qualname__, tuple(sorted(self.kwargs.items())))
+        if key not in objects:
+            objects[key] = get_object(self)
+        return objects[key]
+    return wrapper
+
+
+class CachedObjectMixin:
+
+    @memoize_object
+    def get_object(self, queryset=None):
+        return super().get_object(queryset)
 
 
 class CommentMixin:
     model = Comment
     pk_url_kwarg = 'comment_id'
+    comment_anchor = True
+    comment_removed = False
 
-    def get_object(self):
+    @memoize_object
+    def get_object(self, queryset=None):
         return get_object_or_404(
             self.model,
             pk=self.kwargs[self.pk_url_kwarg],
@@ -18,19 +59,146 @@ class CommentMixin:
         )
 
     def get_success_url(self):
-        return reverse(
-            'blog:post_detail', kwargs={'post_id': self.kwargs['post_id']}
+        return comments.comment_page_url(
+            self.object, anchor=self.comment_anchor,
+            removed=self.comment_removed
         )
 
 
 class OnlyAuthorMixin(UserPassesTestMixin):
 
     def test_func(self):
-        object = self.get_object()
-        return object.author == self.request.user
+        return self.get_object().author_id == self.request.user.id
 
     def handle_no_permission(self):
         url = reverse(
             'blog:post_detail', kwargs={'post_id': self.kwargs['post_id']}
         )
         return redirect(url)
+
+
+class PostImageMixin:
+    """Заказывает уменьшенные копии нового фото публикации.
+
+    Копии делаются в фоне после фиксации транзакции; до их появления
+    карточка показывает оригинал.
+    """
+
+    def form_valid(self, form):
+        image_changed = 'image' in form.changed_data
+        if image_changed:
+            form.instance.thumbnail_widths = []
+        response = super().form_valid(form)
+        image = self.object.image
+        if image_changed and image:
+            transaction.on_commit(partial(
+                tasks.run, thumbnails.generate_for_post,
+                self.object.pk, image.name
+            ))
+        return response
+
+
+class CursorPaginationMixin:
+    """Пагинация ленты без OFFSET-навигации по всем страницам.
+
+    Режим задаётся настройкой POSTS_PAGINATION_MODE: 'cursor' — курсорная
+    пагинация, 'windowed' — номера страниц скользящим окном без точного
+    COUNT(*). Запрос с параметром cursor обслуживается курсором в любом
+    режиме.
+    """
+
+    cursor_kwarg = 'cursor'
+
+    def get_pagination_mode(self):
+        return getattr(settings, 'POSTS_PAGINATION_MODE', 'offset')
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        if self.get_pagination_mode() == 'windowed':
+            return WindowedPaginator(
+                queryset, per_page,
+                count_key=counts.queryset_key(self.request.path, queryset),
+                **kwargs
+            )
+        return super().get_paginator(queryset, per_page, **kwargs)
+
+    def paginate_queryset(self, queryset, page_size):
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        if cursor is None and self.get_pagination_mode() != 'cursor':
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(cursor)
+        except InvalidCursor:
+            raise Http404('Invalid cursor')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class AnonymousPageCacheMixin:
+    """Кеш готовых страниц ленты для анонимных читателей."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if (request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated):
+            return super().dispatch(request, *args, **kwargs)
+
+        def render():
+            response = super(AnonymousPageCacheMixin, self).dispatch(
+                request, *args, **kwargs
+            )
+            with metrics.timer('render'):
+                return response.render()
+
+        return page_cache.serve(request, render)
+
+
+class ConditionalGetMixin:
+    """Ответ 304 Not Modified, если копия страницы у клиента актуальна.
+
+    Валидаторы считаются без запроса самой страницы: Last-Modified — по
+    моменту последнего изменения контента, ETag — ещё и по адресу,
+    поколению контента, ближайшей публикации, пользователю (страница
+    зависит от того, кто её смотрит) и сессии: при входе меняются и она,
+    и CSRF-секрет, так что форма со старой копии уже не пройдёт. Если
+    представление показывает объект (категорию, автора, публикацию), он
+    ищется до проверки, чтобы на несуществующий адрес ответом был 404,
+    а не 304.
+    """
+
+    def get_last_modified(self):
+        return page_cache.last_modified()
+
+    def get_content_version(self):
+        _, version = page_cache.page_key(self.request)
+        return version
+
+    def get_etag(self, last_modified):
+        version = self.get_content_version()
+        stamp = last_modified.timestamp() if last_modified else ''
+        session = self.request.session.session_key or ''
+        raw = (
+            f'{self.request.get_full_path()}.{version}'
+            f'.{self.request.user.id}.{session}.{stamp}'
+        )
+        return quote_etag(md5(raw.encode()).hexdigest())
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        if hasattr(self, 'get_object'):
+            self.get_object()
+        last_modified = self.get_last_modified()
+        timestamp = (
+            timegm(last_modified.utctimetuple()) if last_modified else None
+        )
+        etag = self.get_etag(last_modified)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            if timestamp and not response.has_header('Last-Modified'):
+                response.headers['Last-Modified'] = http_date(timestamp)
+            if not response.has_header('ETag'):
+                response.headers['ETag'] = etag
+        return response
@@ -1,13 +1,35 @@
+import posixpath
+
 from django.db import models
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
-from django.urls import reverse
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django.utils.text import Truncator
 
 from core.models import PublishedCreatedModel
 
+from . import links
+
 
 User = get_user_model()
 
 MAX_SYMBOLS = 256
+EXCERPT_WORDS = 10
+THUMBNAIL_DIR = 'thumbnails'
+
+
+def thumbnail_name(image_name, width):
+    """Имя уменьшенной копии рядом с оригиналом: post_images/thumbnails/."""
+    directory, filename = posixpath.split(image_name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, THUMBNAIL_DIR, f'{stem}_{width}w.jpg')
+
+
+def make_excerpt(text):
+    """Анонс публикации для карточек, как фильтр truncatewords."""
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
 
 
 class Category(PublishedCreatedModel):
@@ -41,9 +63,23 @@ class Location(PublishedCreatedModel):
         return self.name
 
 
+class PostQuerySet(models.QuerySet):
+
+    def recount_comments(self):
+        """Пересчитывает сохранённые счётчики комментариев."""
+        comments = Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(total=Count('pk'))
+        return self.update(
+            comment_count=Coalesce(Subquery(comments.values('total')), 0),
+            updated_at=timezone.now(),
+        )
+
+
 class Post(PublishedCreatedModel):
     title = models.CharField('Заголовок', max_length=MAX_SYMBOLS)
     text = models.TextField('Текст')
+    excerpt = models.TextField('Анонс', blank=True, editable=False)
     pub_date = models.DateTimeField(
         'Дата и время публикации',
         help_text=(
@@ -72,17 +108,63 @@ class Post(PublishedCreatedModel):
         related_name='posts'
     )
     image = models.ImageField('Фото', upload_to='post_images', blank=True)
+    thumbnail_widths = models.JSONField(
+        'Ширины уменьшенных копий', default=list, blank=True, editable=False
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0, editable=False
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('pub_date',),
+                condition=Q(is_published=True),
+                name='post_feed_idx'
+            ),
+            models.Index(
+                fields=('category', 'pub_date'),
+                condition=Q(is_published=True),
+                name='post_category_feed_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_feed_idx'
+            ),
+            models.Index(
+                fields=('updated_at',),
+                name='post_updated_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """Анонс пересчитывается вместе с текстом (см. signals)."""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
-        return reverse('blog:post_detail', kwargs={'post_id': self.id})
+        return links.url('blog:post_detail', post_id=self.id)
+
+    @property
+    def srcset(self):
+        """Значение srcset из готовых уменьшенных копий фото."""
+        return ', '.join(
+            '{} {}w'.format(
+                default_storage.url(thumbnail_name(self.image.name, width)),
+                width,
+            )
+            for width in self.thumbnail_widths
+        )
 
 
 class Comment(models.Model):
@@ -105,6 +187,109 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'комментарии'
         ordering = ('-created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx'
+            ),
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_post_id = instance.__dict__.get('post_id')
+        return instance
 
     def get_absolute_url(self):
-        return reverse('blog:post_detail', kwargs={'post_id': self.post.id})
+        return links.url('blog:post_detail', post_id=self.post_id)
+
+
+class FeedEntry(models.Model):
+    """Публично видимая публикация в материализованной ленте."""
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feed_entry',
+        verbose_name='Публикация',
+    )
+    pub_date = models.DateTimeField('Дата и время публикации')
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='+',
+        db_index=False,
+        verbose_name='Категория',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        db_index=False,
+        verbose_name='Автор публикации',
+    )
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Лента'
+        ordering = ('-pub_date', '-post')
+        indexes = (
+            models.Index(
+                fields=('pub_date', 'post'),
+                name='feed_pub_date_idx'
+            ),
+            models.Index(
+                fields=('category', 'pub_date', 'post'),
+                name='feed_category_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date', 'post'),
+                name='feed_author_idx'
+            ),
+        )
+
+
+class Match(models.Lookup):
+    """Условие MATCH по всей таблице FTS5, в которой лежит поле."""
+
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        rhs, params = self.process_rhs(compiler, connection)
+        qn = compiler.quote_name_unless_alias
+        table = self.lhs.target.model._meta.db_table
+        return f'{qn(self.lhs.alias)}.{qn(table)} MATCH {rhs}', params
+
+
+class SearchField(models.TextField):
+    """Колонка FTS5-таблицы; поддерживает поиск __match."""
+
+
+SearchField.register_lookup(Match)
+
+
+class PostSearch(models.Model):
+    """Строка полнотекстового индекса FTS5, rowid совпадает с id поста.
+
+    Таблица виртуальная и создаётся миграцией, поэтому модель только
+    читается; индекс поддерживает модуль search.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        related_name='search_entry',
+        verbose_name='Публикация',
+    )
+    title = SearchField('Заголовок')
+    text = SearchField('Текст')
+    rank = models.FloatField('Релевантность')
+
+    class Meta:
+        managed = False
+        db_table = 'blog_post_search'
+        verbose_name = 'поисковый индекс'
+        verbose_name_plural = 'Поисковый индекс'
@@ -0,0 +1,109 @@
+import time
+from hashlib import md5
+
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import HttpResponse
+from django.utils import timezone
+
+from core import metrics
+
+from . import fragments, publication
+from .models import Category, Location, Post
+
+PAGE_CACHE_TIMEOUT = 60 * 5
+STALE_TIMEOUT = 60 * 60
+LOCK_TIMEOUT = 10
+WAIT_TIMEOUT = 2
+POLL_INTERVAL = 0.05
+GENERATION = ('blog', 'pages')
+LAST_MODIFIED_KEY = 'blog:pages:last_modified'
+
+
+def bump_generation():
+    """Сбрасывает все закешированные страницы ленты."""
+    fragments.bump_version(*GENERATION)
+    cache.set(LAST_MODIFIED_KEY, timezone.now(), None)
+
+
+def generation():
+    """Текущее поколение контента; меняется при любой его правке."""
+    version, = fragments.versions((GENERATION,))
+    return version
+
+
+def last_modified():
+    """Момент последнего изменения контента.
+
+    Запоминается при каждой смене поколения, поэтому учитывает и
+    удаления; если в кеше его нет, берётся наибольший updated_at.
+    """
+    moment = cache.get(LAST_MODIFIED_KEY)
+    if moment is None:
+        moment = max(filter(None, (
+            model.objects.aggregate(last=Max('updated_at'))['last']
+            for model in (Post, Category, Location)
+        )), default=None)
+        if moment is not None:
+            cache.add(LAST_MODIFIED_KEY, moment, None)
+    return moment
+
+
+def page_key(request):
+    """Ключ страницы: путь, поколение контента и ближайшая публикация."""
+    path = md5(request.get_full_path().encode()).hexdigest()
+    scheduled = publication.next_publication()
+    boundary = int(scheduled.timestamp()) if scheduled else 0
+    return f'blog:page:{path}', f'{generation()}.{boundary}'
+
+
+def _store(response, key, version):
+    if (response.status_code != 200 or response.streaming
+            or response.cookies):
+        return
+    data = (version, response.content, response['Content-Type'])
+    cache.set(
+        f'{key}:{version}', data,
+        publication.cache_timeout(PAGE_CACHE_TIMEOUT)
+    )
+    cache.set(f'{key}:stale', data, STALE_TIMEOUT)
+
+
+def _restore(data):
+    _, content, content_type = data
+    return HttpResponse(content, content_type=content_type)
+
+
+def _wait(key):
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        data = cache.get(key)
+        if data is not None:
+            return data
+    return None
+
+
+def serve(request, render):
+    """Отдаёт страницу из кеша; промах пересчитывает один воркер.
+
+    Остальные запросы на время пересчёта получают устаревшую копию,
+    а если её нет — ждут готовую страницу не дольше WAIT_TIMEOUT.
+    """
+    key, version = page_key(request)
+    data = cache.get(f'{key}:{version}')
+    metrics.cache_lookup('page', data is not None)
+    if data is not None:
+        return _restore(data)
+    lock = f'{key}:lock'
+    if cache.add(lock, version, LOCK_TIMEOUT):
+        try:
+            response = render()
+            _store(response, key, version)
+        finally:
+            cache.delete(lock)
+        return response
+    data = cache.get(f'{key}:stale') or _wait(f'{key}:{version}')
+    if data is not None:
+        return _restore(data)
+    return render()
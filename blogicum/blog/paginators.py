@@ -0,0 +1,231 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.core.paginator import (
+    EmptyPage, Page, PageNotAnInteger, Paginator
+)
+from django.db.models import DateField, Q
+from django.utils.functional import cached_property
+
+from . import counts
+
+FORWARD = 'n'
+BACKWARD = 'p'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(direction, moment=None, pk=None):
+    """Упаковывает позицию в ленте в непрозрачный токен для URL."""
+    payload = [
+        direction,
+        moment.isoformat() if isinstance(moment, datetime) else moment,
+        pk,
+    ]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        raw = urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        direction, moment, pk = json.loads(raw)
+        if direction not in (FORWARD, BACKWARD):
+            raise ValueError
+        if isinstance(moment, str):
+            moment = datetime.fromisoformat(moment)
+        elif not isinstance(moment, (int, float, type(None))):
+            raise ValueError
+        if moment is not None:
+            pk = int(pk)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor(token)
+    return direction, moment, pk
+
+
+class CursorPage(Sequence):
+    is_cursor = True
+
+    def __init__(self, object_list, paginator,
+                 next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Пагинация по ключу (дата, id) без OFFSET и COUNT(*).
+
+    Стоимость любой страницы одинакова: выборка идёт диапазоном по
+    индексу от позиции, записанной в курсоре. Поля ключа и направление
+    берутся из сортировки запроса, если она задана двумя полями,
+    иначе лента идёт по (-pub_date, -pk).
+    """
+
+    last_cursor = encode_cursor(BACKWARD)
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        ordering = list(queryset.query.order_by)
+        if len(ordering) != 2:
+            ordering = ['-pub_date', '-pk']
+        self.descending = ordering[0].startswith('-')
+        self.date_field, self.pk_field = (
+            field.lstrip('-') for field in ordering
+        )
+        self.date_attr = self.date_field.split('__')[-1]
+
+    @cached_property
+    def moment_type(self):
+        """Допустимый тип первого поля ключа: дата или число (rank)."""
+        query = self.queryset.query
+        if self.date_field in query.annotations:
+            return (int, float)
+        model = query.model
+        *path, name = self.date_field.split('__')
+        for part in path:
+            model = model._meta.get_field(part).related_model
+        if isinstance(model._meta.get_field(name), DateField):
+            return datetime
+        return (int, float)
+
+    def decode(self, cursor):
+        """Разбирает курсор и сверяет тип позиции с полем ключа."""
+        if not cursor:
+            return FORWARD, None, None
+        direction, moment, pk = decode_cursor(cursor)
+        if moment is not None and (
+            isinstance(moment, bool)
+            or not isinstance(moment, self.moment_type)
+        ):
+            raise InvalidCursor(cursor)
+        return direction, moment, pk
+
+    def _keyset(self, queryset, direction, moment, pk):
+        descending = self.descending == (direction == FORWARD)
+        sign = '-' if descending else ''
+        queryset = queryset.order_by(
+            sign + self.date_field, sign + self.pk_field
+        )
+        if moment is None:
+            return queryset
+        op = 'lt' if descending else 'gt'
+        return queryset.filter(
+            Q(**{f'{self.date_field}__{op}': moment})
+            | Q(**{f'{self.pk_field}__{op}': pk}),
+            **{f'{self.date_field}__{op}e': moment},
+        )
+
+    def cursor_for(self, obj, direction=FORWARD):
+        """Курсор, указывающий на позицию сразу после объекта."""
+        return encode_cursor(direction, getattr(obj, self.date_attr), obj.pk)
+
+    def get_queryset(self, cursor=None):
+        """Запрос одной страницы: диапазон по индексу с LIMIT."""
+        direction, moment, pk = self.decode(cursor)
+        queryset = self._keyset(self.queryset, direction, moment, pk)
+        return queryset[:self.per_page + 1]
+
+    def page(self, cursor=None):
+        direction, moment, pk = self.decode(cursor)
+        rows = list(self.get_queryset(cursor))
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if direction == BACKWARD:
+            rows.reverse()
+        if not rows:
+            return CursorPage(rows, self)
+        next_cursor = previous_cursor = None
+        if direction == FORWARD and has_more or (
+                direction == BACKWARD and moment is not None):
+            next_cursor = self.cursor_for(rows[-1])
+        if direction == BACKWARD and has_more or (
+                direction == FORWARD and moment is not None):
+            previous_cursor = self.cursor_for(rows[0], BACKWARD)
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+
+class WindowedPage(Page):
+    is_windowed = True
+
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+    @cached_property
+    def last_page_number(self):
+        """Номер последней страницы по приблизительному числу строк."""
+        return max(self.paginator.num_pages, self.number + self.has_more)
+
+    @property
+    def page_window(self):
+        window = self.paginator.window
+        return range(
+            max(1, self.number - window),
+            min(self.last_page_number, self.number + window) + 1,
+        )
+
+
+class WindowedPaginator(Paginator):
+    """Постраничная навигация со скользящим окном номеров страниц.
+
+    Страница выбирается с одной лишней строкой, по ней и определяется
+    наличие следующей. Число строк нужно только для ссылки на последнюю
+    страницу и берётся приблизительным, см. counts.approximate.
+    """
+
+    window = 2
+
+    def __init__(self, object_list, per_page, count_key, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        return counts.approximate(self.count_key, self.object_list)
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы должен быть целым числом')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('На этой странице нет результатов')
+        has_more = len(rows) > self.per_page
+        return WindowedPage(rows[:self.per_page], number, self, has_more)
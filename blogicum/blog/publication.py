@@ -0,0 +1,115 @@
+import math
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from core import metrics
+
+NEXT_PUBLICATION_KEY = 'blog:next_publication'
+WATERMARK_KEY = 'blog:publication_watermark'
+DUE_KEY = 'blog:publication_due'
+NOTHING_SCHEDULED = 'nothing'
+NOTHING_SCHEDULED_TIMEOUT = 60 * 60
+
+
+def now():
+    """Текущее время публикационных часов (всегда aware)."""
+    return timezone.now()
+
+
+def visible_filter(moment=None):
+    """Условия, при которых публикация видна читателям."""
+    return {
+        'pub_date__lt': moment or now(),
+        'is_published': True,
+        'category__is_published': True,
+    }
+
+
+def is_visible(post, moment=None):
+    return (
+        post.is_published
+        and post.pub_date < (moment or now())
+        and post.category is not None
+        and post.category.is_published
+    )
+
+
+def next_publication():
+    """Момент выхода ближайшей отложенной публикации или None.
+
+    Значение кешируется до самого этого момента и сбрасывается
+    сигналами при изменении публикаций и категорий.
+    """
+    from .models import Post
+
+    moment = now()
+    cached = cache.get(NEXT_PUBLICATION_KEY)
+    metrics.cache_lookup(
+        'publication', cached == NOTHING_SCHEDULED
+        or (cached is not None and cached > moment)
+    )
+    if cached == NOTHING_SCHEDULED:
+        return None
+    if cached is not None and cached > moment:
+        return cached
+    scheduled = Post.objects.filter(
+        pub_date__gte=moment,
+        is_published=True,
+        category__is_published=True,
+    ).order_by('pub_date').values_list('pub_date', flat=True).first()
+    if scheduled is None:
+        cache.set(
+            NEXT_PUBLICATION_KEY, NOTHING_SCHEDULED, NOTHING_SCHEDULED_TIMEOUT
+        )
+    else:
+        cache.set(
+            NEXT_PUBLICATION_KEY, scheduled,
+            seconds_until(scheduled, moment)
+        )
+    return scheduled
+
+
+def tick():
+    """Переносит в ленту публикации, время которых наступило.
+
+    Пока не наступил момент из next_publication(), вызов стоит одно
+    обращение к кешу; иначе добавляются публикации с датой после
+    предыдущего срабатывания часов. Момент хранится не дольше
+    NOTHING_SCHEDULED_TIMEOUT: публикацию могли запланировать в другом
+    процессе, и reset() до этого кеша не дошёл.
+    """
+    from . import feed
+
+    moment = now()
+    state = cache.get_many((WATERMARK_KEY, DUE_KEY))
+    watermark, due = state.get(WATERMARK_KEY), state.get(DUE_KEY)
+    if watermark is not None and (
+            due == NOTHING_SCHEDULED or due is not None and due > moment):
+        return
+    feed.promote(since=watermark, until=moment)
+    cache.set(WATERMARK_KEY, moment, None)
+    due = next_publication()
+    if due is None:
+        cache.set(DUE_KEY, NOTHING_SCHEDULED, NOTHING_SCHEDULED_TIMEOUT)
+    else:
+        cache.set(DUE_KEY, due, min(
+            seconds_until(due, moment), NOTHING_SCHEDULED_TIMEOUT
+        ))
+
+
+def seconds_until(moment, start=None):
+    delta = moment - (start or now())
+    return max(1, math.ceil(delta.total_seconds()))
+
+
+def cache_timeout(max_timeout):
+    """Время жизни кеша ленты: не дольше выхода следующей публикации."""
+    scheduled = next_publication()
+    if scheduled is None:
+        return max_timeout
+    return min(max_timeout, seconds_until(scheduled))
+
+
+def reset():
+    cache.delete_many((NEXT_PUBLICATION_KEY, DUE_KEY))
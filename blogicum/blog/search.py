@@ -0,0 +1,81 @@
+from django.db import connection, transaction
+from django.db.models import F
+
+from .models import Post, PostSearch
+
+CHUNK_SIZE = 500
+TABLE = PostSearch._meta.db_table
+INDEXED_FIELDS = {'title', 'text'}
+
+
+def to_match(query):
+    """Запрос FTS5 из ввода пользователя: все слова как префиксы.
+
+    Префиксный поиск находит другие формы слова («кот» — «кота»).
+    Кавычки экранируются, поэтому операторы и скобки FTS5 из ввода
+    не интерпретируются и не приводят к ошибке синтаксиса.
+    """
+    return ' '.join(
+        '"{}"*'.format(word.replace('"', '""')) for word in query.split()
+    )
+
+
+def index_post(post):
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [post.pk])
+        cursor.execute(
+            f'INSERT INTO {TABLE}(rowid, title, text) VALUES (%s, %s, %s)',
+            [post.pk, post.title, post.text],
+        )
+
+
+def remove_post(pk):
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [pk])
+
+
+def reindex(chunk_size=CHUNK_SIZE):
+    """Переиндексирует публикации порциями по возрастанию id.
+
+    Каждая порция — отдельная короткая транзакция, так что запись в
+    базу блокируется ненадолго. Отдаёт id последней публикации порции.
+    """
+    last = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            ids = list(
+                Post.objects.filter(pk__gt=last).order_by('pk')
+                .values_list('pk', flat=True)[:chunk_size]
+            )
+            if not ids:
+                cursor.execute(
+                    f'DELETE FROM {TABLE} WHERE rowid > %s', [last]
+                )
+                return
+            bounds = [last, ids[-1]]
+            cursor.execute(
+                f'DELETE FROM {TABLE} WHERE rowid > %s AND rowid <= %s',
+                bounds,
+            )
+            cursor.execute(
+                f'INSERT INTO {TABLE}(rowid, title, text) '
+                f'SELECT id, title, text FROM {Post._meta.db_table} '
+                'WHERE id > %s AND id <= %s',
+                bounds,
+            )
+        last = ids[-1]
+        yield last
+
+
+def search_posts(queryset, query):
+    """Публикации из queryset, подходящие под запрос, лучшие первыми.
+
+    Чем меньше rank (bm25), тем выше релевантность; при равенстве
+    порядок задаёт id, так что сортировка годится для курсора.
+    """
+    match = to_match(query)
+    if not match:
+        return queryset.none()
+    return queryset.filter(search_entry__title__match=match).annotate(
+        rank=F('search_entry__rank')
+    ).order_by('rank', 'pk')
@@ -0,0 +1,104 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import feed, fragments, page_cache, publication, search
+from .models import Category, Comment, Location, Post, User, make_excerpt
+
+
+def _shift_comment_count(post_id, delta):
+    """Сдвигает счётчик комментариев и отмечает публикацию изменённой."""
+    if post_id is not None:
+        Post.objects.filter(pk=post_id).update(
+            comment_count=F('comment_count') + delta, updated_at=timezone.now()
+        )
+
+
+@receiver(pre_save, sender=Post)
+def post_excerpt(sender, instance, update_fields=None, **kwargs):
+    """Анонс из текста; срабатывает и для loaddata (raw), минуя save()."""
+    if update_fields is None or 'excerpt' in update_fields:
+        instance.excerpt = make_excerpt(instance.text)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        _shift_comment_count(instance.post_id, 1)
+    else:
+        old_post_id = getattr(instance, '_loaded_post_id', instance.post_id)
+        if old_post_id != instance.post_id:
+            _shift_comment_count(old_post_id, -1)
+            _shift_comment_count(instance.post_id, 1)
+        else:
+            _shift_comment_count(instance.post_id, 0)
+    instance._loaded_post_id = instance.post_id
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    _shift_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def schedule_changed(sender, **kwargs):
+    publication.reset()
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        feed.sync_post(instance)
+
+
+@receiver(post_save, sender=Post)
+def post_indexed(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or search.INDEXED_FIELDS & set(update_fields):
+        search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_unindexed(sender, instance, **kwargs):
+    search.remove_post(instance.pk)
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        feed.sync_category(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def card_dependency_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    fragments.bump(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def content_changed(sender, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    page_cache.bump_generation()
@@ -0,0 +1,67 @@
+from io import StringIO
+from itertools import islice
+
+from django.core.cache import cache
+from django.utils.feedgenerator import (
+    Atom1Feed, Rss201rev2Feed, SimplerXMLGenerator
+)
+
+FEED_CLASSES = {'rss': Rss201rev2Feed, 'atom': Atom1Feed}
+FEED_SIZE = 50
+CHUNK_SIZE = 10
+FEED_TIMEOUT = 60 * 15
+ENCODING = 'utf-8'
+ITEMS_MARKER = '<!--items-->'
+
+
+def make_feed(feed_type, last_modified=None, **kwargs):
+    feed = FEED_CLASSES[feed_type](**kwargs)
+    if last_modified is not None:
+        feed.latest_post_date = lambda: last_modified
+    return feed
+
+
+def _frame(feed):
+    """Начало и конец документа: всё, кроме элементов ленты."""
+    out = StringIO()
+    feed.write_items = lambda handler: handler.ignorableWhitespace(
+        ITEMS_MARKER
+    )
+    feed.write(out, ENCODING)
+    head, tail = out.getvalue().split(ITEMS_MARKER)
+    return head, tail
+
+
+def stream(feed_type, posts, make_item, **feed_kwargs):
+    """Отдаёт XML ленты по частям, по CHUNK_SIZE элементов.
+
+    Элементы пишутся теми же обработчиками feedgenerator, что и при
+    обычном write(), поэтому документ совпадает с несобранным по частям.
+    """
+    head, tail = _frame(make_feed(feed_type, **feed_kwargs))
+    yield head
+    feed = make_feed(feed_type, **feed_kwargs)
+    out = StringIO()
+    handler = SimplerXMLGenerator(out, ENCODING)
+    rows = posts.iterator(chunk_size=CHUNK_SIZE)
+    while chunk := list(islice(rows, CHUNK_SIZE)):
+        feed.items = []
+        for post in chunk:
+            feed.add_item(**make_item(post))
+        feed.write_items(handler)
+        yield out.getvalue()
+        out.seek(0)
+        out.truncate()
+    yield tail
+
+
+def cached(key, chunks, timeout=FEED_TIMEOUT):
+    """Пропускает части документа и кеширует его целиком в конце.
+
+    Если клиент оборвал загрузку, неполный документ не сохраняется.
+    """
+    parts = []
+    for part in chunks:
+        parts.append(part)
+        yield part
+    cache.set(key, ''.join(parts), timeout)
@@ -0,0 +1,13 @@
+import threading
+
+from django.db import connections
+
+
+def run(func, *args):
+    """Выполняет func(*args) в фоновом потоке, вне обработки запроса."""
+    def target():
+        try:
+            func(*args)
+        finally:
+            connections.close_all()
+    threading.Thread(target=target, daemon=True).start()
@@ -0,0 +1,15 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from blog import fragments
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts):
+    """Карточки всей страницы за один проход.
+
+    {% post_cards page_obj as cards %}, затем цикл по cards.
+    """
+    return [mark_safe(html) for html in fragments.render_cards(posts)]
@@ -0,0 +1,11 @@
+from django import template
+
+from blog import links
+
+register = template.Library()
+
+
+@register.simple_tag
+def blog_url(name, *args, **kwargs):
+    """Замена {% url %} для горячих шаблонов, через blog.links."""
+    return links.url(name, *args, **kwargs)
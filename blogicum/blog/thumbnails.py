@@ -0,0 +1,52 @@
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from . import fragments, page_cache
+from .models import Post, thumbnail_name
+
+WIDTHS = (320, 640, 1280)
+QUALITY = 85
+
+
+def generate(image_name):
+    """Сохраняет уменьшенные копии фото, возвращает их ширины.
+
+    Копии шире оригинала не создаются. Работает только с хранилищем,
+    поэтому годится для запуска в отдельном процессе.
+    """
+    with default_storage.open(image_name) as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image = image.convert('RGB')
+    widths = []
+    for width in WIDTHS:
+        if width >= image.width:
+            break
+        height = round(image.height * width / image.width)
+        thumbnail = image.resize((width, height), Image.Resampling.LANCZOS)
+        content = BytesIO()
+        thumbnail.save(content, 'JPEG', quality=QUALITY, optimize=True,
+                       progressive=True)
+        name = thumbnail_name(image_name, width)
+        default_storage.delete(name)
+        default_storage.save(name, ContentFile(content.getvalue()))
+        widths.append(width)
+    return widths
+
+
+def store(post_id, image_name, widths):
+    """Записывает ширины, если фото публикации за это время не сменилось."""
+    updated = Post.objects.filter(pk=post_id, image=image_name).update(
+        thumbnail_widths=widths, updated_at=timezone.now()
+    )
+    if updated:
+        fragments.bump_version(Post._meta.label_lower, post_id)
+        page_cache.bump_generation()
+
+
+def generate_for_post(post_id, image_name):
+    store(post_id, image_name, generate(image_name))
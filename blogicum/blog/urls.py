@@ -31,6 +31,11 @@ post_urls = [
         views.PostDeleteView.as_view(),
         name='delete_post'
     ),
+    path(
+        '<int:post_id>/comments/',
+        views.PostCommentsView.as_view(),
+        name='comments'
+    ),
     path(
         '<int:post_id>/add_comment/',
         views.CommentCreateView.as_view(),
@@ -52,16 +57,36 @@ urlpatterns = [
         views.IndexView.as_view(),
         name='index'
     ),
+    path(
+        'feed/<str:feed_type>/',
+        views.FeedView.as_view(),
+        name='index_feed'
+    ),
+    path(
+        'search/',
+        views.SearchView.as_view(),
+        name='search'
+    ),
     path(
         'category/<slug:category_slug>/',
         views.CategoryPostsView.as_view(),
         name='category_posts'
     ),
+    path(
+        'category/<slug:category_slug>/feed/<str:feed_type>/',
+        views.CategoryFeedView.as_view(),
+        name='category_feed'
+    ),
     path(
         'profile/<str:username>/',
         views.ProfileListView.as_view(),
         name='profile'
     ),
+    path(
+        'profile/<str:username>/feed/<str:feed_type>/',
+        views.ProfileFeedView.as_view(),
+        name='profile_feed'
+    ),
     path(
         'edit_profile/',
         views.UserUpdateView.as_view(),
@@ -1,6 +1,5 @@
-from datetime import datetime, timezone
-
-from django.http import Http404
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -8,16 +7,26 @@ from django.views.generic import (CreateView,
                                   ListView,
                                   UpdateView,
                                   DeleteView,
-                                  DetailView)
-from django.db.models import Count
+                                  DetailView,
+                                  View)
+from django.db import transaction
 from django.urls import reverse_lazy, reverse
 from django.contrib.auth.forms import UserCreationForm
+from django.utils.http import urlencode
+
+from core import metrics
 
 from .models import Post, Category, Comment
+from .paginators import InvalidCursor
 from .forms import (
     EditUserProfileForm, CreateUpdatePostForm, CommentForm
 )
-from .mixins import OnlyAuthorMixin, CommentMixin
+from .mixins import (
+    AnonymousPageCacheMixin, CachedObjectMixin, CommentMixin,
+    ConditionalGetMixin, CursorPaginationMixin, OnlyAuthorMixin,
+    PostImageMixin, memoize_object
+)
+from . import comments, page_cache, publication, search, syndication
 
 User = get_user_model()
 
@@ -47,28 +56,37 @@ class UserUpdateView(LoginRequiredMixin, UpdateView):
         return self.request.user
 
 
-class ProfileListView(ListView):
+class ProfileListView(
+    ConditionalGetMixin, AnonymousPageCacheMixin, CursorPaginationMixin,
+    ListView
+):
     model = Post
     paginate_by = COUNT_OF_POSTS
     template_name = 'blog/profile.html'
 
     def get_queryset(self):
-        qs = get_filtered_qs(
-            is_hidden=(self.request.user != self.get_object()),
-            is_comment=True
-        ).filter(author=self.get_object())
-        return qs
+        if self.request.user == self.get_object():
+            return get_filtered_qs(is_comment=True).filter(
+                author=self.get_object()
+            )
+        return get_filtered_qs(is_hidden=True, is_comment=True).filter(
+            feed_entry__author=self.get_object()
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['profile'] = self.get_object()
         return context
 
-    def get_object(self):
+    @memoize_object
+    def get_object(self, queryset=None):
         return get_object_or_404(User, username=self.kwargs['username'])
 
 
-class UpdatePostView(LoginRequiredMixin, OnlyAuthorMixin, UpdateView):
+class UpdatePostView(
+    LoginRequiredMixin, OnlyAuthorMixin, CachedObjectMixin, PostImageMixin,
+    UpdateView
+):
     model = Post
     form_class = CreateUpdatePostForm
     template_name = 'blog/create.html'
@@ -78,7 +96,7 @@ class UpdatePostView(LoginRequiredMixin, OnlyAuthorMixin, UpdateView):
         return self.object.get_absolute_url()
 
 
-class CreatePostView(LoginRequiredMixin, CreateView):
+class CreatePostView(LoginRequiredMixin, PostImageMixin, CreateView):
     model = Post
     template_name = 'blog/create.html'
     form_class = CreateUpdatePostForm
@@ -93,7 +111,9 @@ class CreatePostView(LoginRequiredMixin, CreateView):
         )
 
 
-class PostDeleteView(LoginRequiredMixin, OnlyAuthorMixin, DeleteView):
+class PostDeleteView(
+    LoginRequiredMixin, OnlyAuthorMixin, CachedObjectMixin, DeleteView
+):
     model = Post
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
@@ -106,15 +126,14 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
+    @transaction.atomic
     def form_valid(self, form):
         form.instance.author = self.request.user
         form.instance.post = get_object_or_404(Post, pk=self.kwargs['post_id'])
         return super().form_valid(form)
 
     def get_success_url(self):
-        return reverse(
-            'blog:post_detail', kwargs={'post_id': self.kwargs['post_id']}
-        )
+        return comments.comment_page_url(self.object)
 
 
 class CommentUpdateView(
@@ -129,66 +148,131 @@ class CommentDeleteView(
 ):
     form_class = CommentForm
     template_name = 'blog/comment.html'
+    comment_anchor = False
+    comment_removed = True
 
 
 def get_filtered_qs(is_hidden=False, is_comment=False):
-    """Функция выполняющая базовый запрос."""
+    """Функция выполняющая базовый запрос.
+
+    Публичные списки (is_hidden) читаются из материализованной ленты
+    FeedEntry, где лежат только видимые читателям публикации.
+    Спискам (is_comment) полный текст не нужен: карточка выводит
+    сохранённый анонс excerpt, поэтому text не загружается.
+    """
     queryset = Post.objects.select_related(
         'category',
         'location',
         'author'
     )
     if is_comment:
-        queryset = queryset.annotate(
-            comment_count=Count('comments')).order_by('-pub_date')
+        queryset = queryset.defer('text').order_by('-pub_date', '-pk')
     if is_hidden:
+        publication.tick()
         queryset = queryset.filter(
-            pub_date__lt=datetime.now(),
-            is_published=True,
-            category__is_published=True
-        )
+            feed_entry__pub_date__lt=publication.now()
+        ).order_by('-feed_entry__pub_date', '-feed_entry__post_id')
     return queryset
 
 
-class IndexView(ListView):
+class IndexView(
+    ConditionalGetMixin, AnonymousPageCacheMixin, CursorPaginationMixin,
+    ListView
+):
     template_name = 'blog/index.html'
-    context_object_name = 'page_obj'
     paginate_by = COUNT_OF_POSTS
-    queryset = get_filtered_qs(is_hidden=True, is_comment=True)
 
+    def get_queryset(self):
+        return get_filtered_qs(is_hidden=True, is_comment=True)
+
+
+class SearchView(CursorPaginationMixin, ListView):
+    template_name = 'blog/search.html'
+    paginate_by = COUNT_OF_POSTS
+    query_kwarg = 'q'
+
+    def get_pagination_mode(self):
+        return 'cursor'
 
-class PostDetailView(DetailView):
+    def get_search_query(self):
+        return self.request.GET.get(self.query_kwarg, '').strip()
+
+    def get_queryset(self):
+        return search.search_posts(
+            get_filtered_qs(is_hidden=True, is_comment=True),
+            self.get_search_query()
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.get_search_query()
+        context['query'] = query
+        context['pagination_query'] = (
+            urlencode({self.query_kwarg: query}) + '&'
+        )
+        return context
+
+
+class PostDetailView(ConditionalGetMixin, DetailView):
     model = Post
     template_name = 'blog/detail.html'
 
+    comments_cursor_kwarg = 'comments'
+
+    def get_content_version(self):
+        # Видимость публикации по расписанию проверяет get_object(),
+        # поэтому ближайшая публикация в версии не нужна.
+        return page_cache.generation()
+
+    def get_last_modified(self):
+        post = self.get_object()
+        return max(
+            related.updated_at
+            for related in (post, post.category, post.location)
+            if related is not None
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = Comment.objects.filter(
-            post__id=self.kwargs['post_id']).order_by('created_at')
+        try:
+            context['comments'] = comments.comments_page(
+                self.kwargs['post_id'],
+                self.request.GET.get(self.comments_cursor_kwarg)
+            )
+        except InvalidCursor:
+            raise Http404('Invalid cursor')
         return context
 
-    def get_object(self):
+    @memoize_object
+    def get_object(self, queryset=None):
         queryset = get_filtered_qs()
         obj = get_object_or_404(queryset, pk=self.kwargs['post_id'])
-        if obj.author != self.request.user:
-            if (not obj.is_published
-                    or obj.pub_date > datetime.now(timezone.utc)
-                    or not obj.category.is_published):
+        if obj.author_id != self.request.user.id:
+            if not publication.is_visible(obj):
                 raise Http404('Page not found')
         return obj
 
 
-class CategoryPostsView(ListView):
+class PostCommentsView(PostDetailView):
+    """Фрагмент со следующей порцией комментариев для подгрузки."""
+
+    template_name = 'includes/comment_list.html'
+    comments_cursor_kwarg = 'cursor'
+
+
+class CategoryPostsView(
+    ConditionalGetMixin, AnonymousPageCacheMixin, CursorPaginationMixin,
+    ListView
+):
     model = Post
     template_name = 'blog/category.html'
-    context_object_name = 'page_obj'
     paginate_by = COUNT_OF_POSTS
 
     def get_queryset(self):
         category_of_post = self.get_object()
         return get_filtered_qs(is_hidden=True, is_comment=True).filter(
-            category=category_of_post)
+            feed_entry__category=category_of_post)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -196,7 +280,126 @@ class CategoryPostsView(ListView):
         context['category'] = category_of_post
         return context
 
-    def get_object(self):
+    @memoize_object
+    def get_object(self, queryset=None):
+        return get_object_or_404(
+            Category, slug=self.kwargs['category_slug'], is_published=True
+        )
+
+
+class FeedView(ConditionalGetMixin, View):
+    """RSS/Atom-лента видимых публикаций, отдаётся потоком.
+
+    Готовый документ кешируется по адресу ленты и версии контента, так
+    что опрос агрегаторами обходится без запросов к БД.
+    """
+
+    title = 'Блогикум'
+    description = 'Новые публикации'
+
+    def get_queryset(self):
+        return get_filtered_qs(is_hidden=True, is_comment=True)
+
+    def get_link(self):
+        return reverse('blog:index')
+
+    def get_feed_kwargs(self):
+        request = self.request
+        return {
+            'title': self.title,
+            'link': request.build_absolute_uri(self.get_link()),
+            'description': self.description,
+            'feed_url': request.build_absolute_uri(),
+            'language': 'ru',
+            'last_modified': self.get_last_modified(),
+        }
+
+    def make_item(self, post):
+        link = self.request.build_absolute_uri(post.get_absolute_url())
+        return {
+            'title': post.title,
+            'link': link,
+            'unique_id': link,
+            'description': post.excerpt,
+            'pubdate': post.pub_date,
+            'updateddate': post.updated_at,
+            'author_name': post.author.username,
+            'categories': (post.category.title,),
+        }
+
+    def get(self, request, *args, **kwargs):
+        feed_type = self.kwargs['feed_type']
+        if feed_type not in syndication.FEED_CLASSES:
+            raise Http404('Unknown feed type')
+        content_type = syndication.FEED_CLASSES[feed_type].content_type
+        key, version = page_cache.page_key(request)
+        key = f'{key}:feed:{version}'
+        content = cache.get(key)
+        metrics.cache_lookup('feed', content is not None)
+        if content is not None:
+            return HttpResponse(content, content_type=content_type)
+        chunks = syndication.stream(
+            feed_type,
+            self.get_queryset()[:syndication.FEED_SIZE],
+            self.make_item,
+            **self.get_feed_kwargs()
+        )
+        return StreamingHttpResponse(
+            syndication.cached(
+                key, chunks,
+                publication.cache_timeout(syndication.FEED_TIMEOUT)
+            ),
+            content_type=content_type
+        )
+
+
+class CategoryFeedView(FeedView):
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            feed_entry__category=self.get_object()
+        )
+
+    def get_link(self):
+        return reverse(
+            'blog:category_posts',
+            kwargs={'category_slug': self.kwargs['category_slug']}
+        )
+
+    def get_feed_kwargs(self):
+        category = self.get_object()
+        return {
+            **super().get_feed_kwargs(),
+            'title': f'{self.title}: {category.title}',
+            'description': category.description,
+        }
+
+    @memoize_object
+    def get_object(self, queryset=None):
         return get_object_or_404(
             Category, slug=self.kwargs['category_slug'], is_published=True
         )
+
+
+class ProfileFeedView(FeedView):
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            feed_entry__author=self.get_object()
+        )
+
+    def get_link(self):
+        return reverse(
+            'blog:profile', kwargs={'username': self.kwargs['username']}
+        )
+
+    def get_feed_kwargs(self):
+        return {
+            **super().get_feed_kwargs(),
+            'title': f'{self.title}: @{self.get_object().username}',
+            'description': 'Публикации автора',
+        }
+
+    @memoize_object
+    def get_object(self, queryset=None):
+        return get_object_or_404(User, username=self.kwargs['username'])
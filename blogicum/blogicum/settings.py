@@ -31,6 +31,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ServerTimingMiddleware',
+    'core.middleware.TemplateProfilerMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -116,3 +118,27 @@ LOGIN_REDIRECT_URL = '/'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+POSTS_PAGINATION_MODE = 'cursor'
+
+# Доля запросов, которые замеряет core.middleware.ServerTimingMiddleware.
+PERFORMANCE_SAMPLE_RATE = 1.0
+
+# Профилирование шаблонов: отчёт для flamegraph.pl пишется в файл.
+TEMPLATE_PROFILING = False
+
+TEMPLATE_PROFILE_FILE = BASE_DIR / 'template_profile.folded'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'blogicum.performance': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
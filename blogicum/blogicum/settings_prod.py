@@ -0,0 +1,79 @@
+"""Настройки для продакшена: DJANGO_SETTINGS_MODULE=blogicum.settings_prod.
+
+Без debug_toolbar, с DEBUG=False и шаблонами, скомпилированными один
+раз: в памяти воркера и в TEMPLATE_CACHE_DIR между перезапусками.
+Кеш общий для всех воркеров и management-команд: в таблице
+blogicum_cache (создаётся командой createcachetable) или в memcached,
+если задан DJANGO_MEMCACHED_LOCATION.
+"""
+import os
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401, F403
+from .settings import BASE_DIR, INSTALLED_APPS, MIDDLEWARE, TEMPLATES
+
+DEBUG = False
+
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured(
+        'Задайте DJANGO_SECRET_KEY: ключ из settings.py публичный.'
+    )
+
+ALLOWED_HOSTS = os.environ.get(
+    'DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1'
+).split(',')
+
+# Поколения контента, версии карточек, момент последнего изменения и
+# расписание публикаций живут в кеше. С LocMemCache у каждого воркера
+# они свои: правка через один воркер не сбрасывает ETag другого, а
+# сбросы из команд (bulk_loaddata, rebuild_feed) не видит никто.
+if os.environ.get('DJANGO_MEMCACHED_LOCATION'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ['DJANGO_MEMCACHED_LOCATION'].split(','),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'blogicum_cache',
+            'OPTIONS': {'MAX_ENTRIES': 100_000},
+        }
+    }
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'debug_toolbar']
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if not middleware.startswith('debug_toolbar.')
+]
+
+# Шаблоны из этого каталога загружаются через pickle: он должен быть
+# доступен на запись только пользователю, от которого работает сервис.
+TEMPLATE_CACHE_DIR = Path(
+    os.environ.get('DJANGO_TEMPLATE_CACHE_DIR', BASE_DIR / 'template_cache')
+)
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [(
+            'core.template_loaders.Loader',
+            [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ],
+            TEMPLATE_CACHE_DIR,
+        )],
+    },
+}]
+
+PERFORMANCE_SAMPLE_RATE = 0.01
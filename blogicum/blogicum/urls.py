@@ -15,7 +15,7 @@ urlpatterns = [
 handler404 = 'pages.views.error_404'
 handler500 = 'pages.views.error_500'
 
-if settings.DEBUG:
+if settings.DEBUG and 'debug_toolbar' in settings.INSTALLED_APPS:
     import debug_toolbar
 
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import template_profiler
+
+
+class Command(BaseCommand):
+    help = (
+        'Сводка отчёта профилировщика шаблонов: самые долгие шаблоны'
+        ' каждого представления. Сам отчёт можно передать flamegraph.pl.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'report', nargs='?', default=settings.TEMPLATE_PROFILE_FILE,
+            help='Файл со стеками шаблонов.'
+        )
+        parser.add_argument(
+            '--top', type=int, default=5,
+            help='Сколько шаблонов показывать для представления.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['report'], encoding='utf-8') as report:
+                totals = template_profiler.summarize(report)
+        except FileNotFoundError:
+            raise CommandError(f'Нет отчёта {options["report"]}.')
+        for view, templates in sorted(totals.items()):
+            self.stdout.write(view)
+            for name, micros in templates.most_common(options['top']):
+                self.stdout.write(f'  {micros / 1000:10.1f} мс  {name}')
@@ -0,0 +1,70 @@
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar('blogicum_metrics', default=None)
+
+
+class RequestMetrics:
+    """Счётчики и суммарные длительности одного запроса, в секундах."""
+
+    def __init__(self):
+        self.counters = Counter()
+        self.timings = defaultdict(float)
+
+    def cache_totals(self):
+        hits = sum(
+            value for name, value in self.counters.items()
+            if name.startswith('cache.') and name.endswith('.hit')
+        )
+        misses = sum(
+            value for name, value in self.counters.items()
+            if name.startswith('cache.') and name.endswith('.miss')
+        )
+        return hits, misses
+
+
+@contextmanager
+def collect():
+    """Включает сбор метрик для кода внутри блока."""
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+def incr(name, amount=1):
+    """Увеличивает счётчик; вне собираемого запроса ничего не делает."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.counters[name] += amount
+
+
+def cache_lookup(name, hit):
+    """Отмечает попадание или промах в кеш с именем name."""
+    incr(f'cache.{name}.{"hit" if hit else "miss"}')
+
+
+def add_time(name, seconds):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.timings[name] += seconds
+
+
+@contextmanager
+def timer(name):
+    if _current.get() is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(name, time.perf_counter() - started)
@@ -0,0 +1,122 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import metrics, template_profiler
+
+logger = logging.getLogger('blogicum.performance')
+
+
+class SQLTimer:
+    """Обёртка выполнения запросов: считает их число и время."""
+
+    def __call__(self, execute, sql, params, many, context):
+        metrics.incr('sql')
+        with metrics.timer('sql'):
+            return execute(sql, params, many, context)
+
+
+class ServerTimingMiddleware:
+    """Замеряет запрос и отдаёт итоги в Server-Timing и в журнал.
+
+    Замеряется только доля запросов PERFORMANCE_SAMPLE_RATE; остальные
+    проходят без обёрток и заголовка.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = getattr(settings, 'PERFORMANCE_SAMPLE_RATE', 0)
+        if rate <= 0 or random.random() >= rate:
+            return self.get_response(request)
+        with metrics.collect() as collected, ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(SQLTimer()))
+            started = time.perf_counter()
+            response = self.get_response(request)
+            total = time.perf_counter() - started
+        response['Server-Timing'] = self.header(collected, total)
+        self.log(request, response, collected, total)
+        return response
+
+    def process_template_response(self, request, response):
+        collected = metrics.current()
+        if collected is None:
+            return response
+        render = response.render
+
+        def timed_render():
+            with metrics.timer('render'):
+                return render()
+
+        response.render = timed_render
+        return response
+
+    @staticmethod
+    def header(collected, total):
+        hits, misses = collected.cache_totals()
+        parts = (
+            f'sql;dur={collected.timings["sql"] * 1000:.1f}'
+            f';desc="{collected.counters["sql"]} queries"',
+            f'render;dur={collected.timings["render"] * 1000:.1f}',
+            f'cache;desc="hits={hits} misses={misses}"',
+            f'total;dur={total * 1000:.1f}',
+        )
+        return ', '.join(parts)
+
+    @staticmethod
+    def log(request, response, collected, total):
+        match = request.resolver_match
+        hits, misses = collected.cache_totals()
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+            'sql_count': collected.counters['sql'],
+            'sql_ms': round(collected.timings['sql'] * 1000, 1),
+            'render_ms': round(collected.timings['render'] * 1000, 1),
+            'cache_hits': hits,
+            'cache_misses': misses,
+            'caches': {
+                name[len('cache.'):]: value
+                for name, value in sorted(collected.counters.items())
+                if name.startswith('cache.')
+            },
+        }
+        logger.info(json.dumps(record, ensure_ascii=False), extra=record)
+
+
+class TemplateProfilerMiddleware:
+    """Профилирует шаблоны каждого запроса при TEMPLATE_PROFILING.
+
+    Стеки шаблонов дописываются в TEMPLATE_PROFILE_FILE с именем
+    представления в корне; при выключенной настройке middleware
+    отключается целиком.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'TEMPLATE_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        template_profiler.install()
+
+    def __call__(self, request):
+        with template_profiler.profile() as collected:
+            response = self.get_response(request)
+        match = request.resolver_match
+        template_profiler.write(
+            settings.TEMPLATE_PROFILE_FILE,
+            template_profiler.collapsed(
+                match.view_name if match else request.path, collected
+            ),
+        )
+        return response
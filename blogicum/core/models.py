@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class PublishedCreatedModel(models.Model):
@@ -8,6 +9,16 @@ class PublishedCreatedModel(models.Model):
         help_text='Снимите галочку, чтобы скрыть публикацию.'
     )
     created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    updated_at = models.DateTimeField('Изменено', default=timezone.now)
 
     class Meta:
         abstract = True
+
+    def save(self, *args, **kwargs):
+        # Не auto_now: сырые сохранения (loaddata) его пропускают, а
+        # у записей фикстур без updated_at должно остаться значение.
+        self.updated_at = timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'updated_at'}
+        super().save(*args, **kwargs)
@@ -0,0 +1,159 @@
+"""Загрузчик шаблонов с кешем скомпилированных шаблонов на диске.
+
+Обычный cached.Loader держит шаблоны в памяти процесса, поэтому каждый
+новый воркер заново разбирает base.html и все include. Этот загрузчик
+вдобавок сохраняет скомпилированное дерево узлов в каталог и при
+следующем запуске читает его оттуда. Ключ записи — хеш пути и текста
+шаблона вместе с отпечатком кода, от которого зависит разбор: версии
+Django, настроек движка и исходников всех библиотек тегов. Изменённый
+шаблон или обновлённый тег просто получают новую запись.
+
+Записи читаются через pickle, то есть исполняются при загрузке, поэтому
+писать в каталог кеша должен только сам сервис: он не должен быть
+доступен на запись другим пользователям.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from importlib import import_module
+from pathlib import Path
+
+import django
+from django.template import Template, TemplateDoesNotExist
+from django.template import smartif
+from django.template.loaders import base, cached
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+# Операторы {% if %} — экземпляры локальных классов из smartif.infix() и
+# prefix(); pickle их не находит, поэтому они пишутся по ключу OPERATORS.
+_OPERATOR_KEYS = {cls: key for key, cls in smartif.OPERATORS.items()}
+
+
+def _restore_operator(key, state):
+    operator = smartif.OPERATORS[key].__new__(smartif.OPERATORS[key])
+    operator.__dict__.update(state)
+    return operator
+
+
+class _Pickler(pickle.Pickler):
+    """Движок и загрузчики пишутся ссылками, а не копиями."""
+
+    def __init__(self, file, loader):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.loader = loader
+
+    def persistent_id(self, obj):
+        if obj is self.loader.engine:
+            return 'engine'
+        if isinstance(obj, base.Loader):
+            if obj in self.loader.loaders:
+                return ('loader', self.loader.loaders.index(obj))
+            raise pickle.PicklingError(f'Unknown template loader {obj!r}')
+        return None
+
+    def reducer_override(self, obj):
+        key = _OPERATOR_KEYS.get(type(obj))
+        if key is not None:
+            return _restore_operator, (key, obj.__dict__)
+        return NotImplemented
+
+
+class _Unpickler(pickle.Unpickler):
+
+    def __init__(self, file, loader):
+        super().__init__(file)
+        self.loader = loader
+
+    def persistent_load(self, pid):
+        if pid == 'engine':
+            return self.loader.engine
+        _, index = pid
+        return self.loader.loaders[index]
+
+
+class _PersistentCompiler(base.Loader):
+    """Компиляция шаблона через дисковый кеш; подмешивается под cached."""
+
+    def get_template(self, template_name, skip=None):
+        tried = []
+        for origin in self.get_template_sources(template_name):
+            if skip is not None and origin in skip:
+                tried.append((origin, 'Skipped to avoid recursion'))
+                continue
+            try:
+                contents = self.get_contents(origin)
+            except TemplateDoesNotExist:
+                tried.append((origin, 'Source does not exist'))
+                continue
+            return self.compile(contents, origin)
+        raise TemplateDoesNotExist(template_name, tried=tried)
+
+    @cached_property
+    def fingerprint(self):
+        """Хеш всего, что влияет на разбор: Django, движок, библиотеки."""
+        engine = self.engine
+        digest = hashlib.sha256('\0'.join((
+            django.get_version(), repr(engine.debug),
+            repr(engine.autoescape), repr(engine.string_if_invalid),
+            *engine.builtins,
+            *(f'{name}={path}' for name, path in
+              sorted(engine.libraries.items())),
+        )).encode())
+        for path in sorted({*engine.builtins, *engine.libraries.values()}):
+            source = getattr(import_module(path), '__file__', None)
+            if source:
+                digest.update(Path(source).read_bytes())
+        return digest.hexdigest()
+
+    def cache_path(self, contents, origin):
+        key = hashlib.sha256('\0'.join((
+            self.fingerprint, origin.name, origin.template_name or '',
+            contents,
+        )).encode()).hexdigest()
+        return self.cache_dir / f'{key}.pickle'
+
+    def compile(self, contents, origin):
+        path = self.cache_path(contents, origin)
+        try:
+            with open(path, 'rb') as stored:
+                return _Unpickler(stored, self).load()
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logger.warning('Не удалось прочитать %s', path, exc_info=True)
+        template = Template(contents, origin, origin.template_name,
+                            self.engine)
+        self.store(path, template)
+        return template
+
+    def store(self, path, template):
+        """Атомарно записывает шаблон; ошибка записи не мешает ответу."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handle, temporary = tempfile.mkstemp(dir=path.parent)
+            try:
+                with os.fdopen(handle, 'wb') as stored:
+                    _Pickler(stored, self).dump(template)
+                os.replace(temporary, path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        except Exception:
+            logger.warning('Не удалось сохранить шаблон %s', template.name,
+                           exc_info=True)
+
+
+class Loader(cached.Loader, _PersistentCompiler):
+    """cached.Loader, который при промахе в памяти читает кеш на диске.
+
+    Подключается как ('core.template_loaders.Loader', [загрузчики],
+    каталог кеша).
+    """
+
+    def __init__(self, engine, loaders, cache_dir):
+        super().__init__(engine, loaders)
+        self.cache_dir = Path(cache_dir)
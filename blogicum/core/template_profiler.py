@@ -0,0 +1,119 @@
+"""Профилировщик отрисовки шаблонов и вложенных include.
+
+Время каждого шаблона замеряется обёрткой над Template._render и
+копится по стекам вида «имя представления;шаблон;вложенный шаблон».
+Отчёт пишется в формате collapsed stacks (одна строка на стек,
+собственное время в микросекундах), который понимают flamegraph.pl,
+speedscope и inferno.
+"""
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.template.base import Template
+
+_current = ContextVar('blogicum_template_profile', default=None)
+_write_lock = threading.Lock()
+_original_render = None
+
+
+class Profile:
+    """Стек шаблонов одного запроса и их собственное время."""
+
+    def __init__(self):
+        self.stack = []
+        self.self_time = Counter()
+
+    def enter(self, name):
+        self.stack.append([name, time.perf_counter(), 0.0])
+
+    def leave(self):
+        name, started, children = self.stack.pop()
+        elapsed = time.perf_counter() - started
+        path = tuple(frame[0] for frame in self.stack) + (name,)
+        self.self_time[path] += elapsed - children
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+
+def _clean(name):
+    return str(name).replace(';', ':').replace(' ', '_')
+
+
+def _frame(template):
+    return _clean(
+        template.origin.template_name or template.name or '<string>'
+    )
+
+
+def _profiled_render(template, context):
+    profile = _current.get()
+    if profile is None:
+        return _original_render(template, context)
+    profile.enter(_frame(template))
+    try:
+        return _original_render(template, context)
+    finally:
+        profile.leave()
+
+
+def install():
+    """Подменяет Template._render; повторный вызов ничего не делает."""
+    global _original_render
+    if _original_render is None:
+        _original_render = Template._render
+        Template._render = _profiled_render
+
+
+def uninstall():
+    global _original_render
+    if _original_render is not None:
+        Template._render = _original_render
+        _original_render = None
+
+
+@contextmanager
+def profile():
+    """Собирает время шаблонов, отрисованных внутри блока."""
+    collected = Profile()
+    token = _current.set(collected)
+    try:
+        yield collected
+    finally:
+        _current.reset(token)
+
+
+def collapsed(root, collected):
+    """Строки отчёта: стеки под корнем root и время в микросекундах."""
+    lines = []
+    for path, seconds in sorted(collected.self_time.items()):
+        micros = round(seconds * 1_000_000)
+        if micros > 0:
+            lines.append(f'{";".join((_clean(root),) + path)} {micros}')
+    return lines
+
+
+def write(path, lines):
+    """Дописывает строки в отчёт; одинаковые стеки суммирует читатель."""
+    if not lines:
+        return
+    with _write_lock, open(path, 'a', encoding='utf-8') as report:
+        report.write('\n'.join(lines) + '\n')
+
+
+def summarize(lines):
+    """Полное время каждого шаблона по представлениям, в микросекундах.
+
+    Шаблон, встретившийся в стеке несколько раз, учитывается один раз.
+    """
+    totals = defaultdict(Counter)
+    for line in lines:
+        stack, _, micros = line.rstrip().rpartition(' ')
+        if not stack:
+            continue
+        view, *templates = stack.split(';')
+        for name in set(templates):
+            totals[view][name] += int(micros)
+    return totals
@@ -0,0 +1,94 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from blog import bulk_load
+from blog.models import (Category, Comment, FeedEntry, Location, Post, User,
+                         make_excerpt)
+
+pytestmark = [pytest.mark.django_db]
+
+DB_JSON = Path(__file__).resolve().parent.parent / "blogicum" / "db.json"
+
+
+def test_iter_objects_reads_in_small_blocks():
+    objects = [{"n": i, "text": "}{ ,[]" * i} for i in range(20)]
+    as_array = io.StringIO(json.dumps(objects, indent=2))
+    as_lines = io.StringIO("\n".join(json.dumps(obj) for obj in objects))
+    for stream in (as_array, as_lines):
+        assert list(bulk_load.iter_objects(stream, block_size=7)) == objects
+
+
+def test_bulk_load_db_json():
+    fixture = json.loads(DB_JSON.read_text(encoding="utf-8"))
+    call_command("bulk_loaddata", str(DB_JSON), batch_size=5)
+    for model in (Category, Location, Post, User):
+        expected = {
+            obj["pk"] for obj in fixture
+            if obj["model"] == model._meta.label_lower
+        }
+        assert set(model.objects.values_list("pk", flat=True)) == expected
+    post = Post.objects.get(pk=1)
+    assert post.created_at.year == 2022, (
+        "Убедитесь, что загрузчик сохраняет даты из фикстуры."
+    )
+    assert post.excerpt
+    assert FeedEntry.objects.exists(), (
+        "Убедитесь, что после загрузки пересобирается лента."
+    )
+
+
+def test_loaddata_db_json():
+    call_command("loaddata", str(DB_JSON), verbosity=0)
+    fixture = json.loads(DB_JSON.read_text(encoding="utf-8"))
+    posts = [obj for obj in fixture if obj["model"] == "blog.post"]
+    assert Post.objects.count() == len(posts), (
+        "Убедитесь, что фикстура db.json загружается через loaddata."
+    )
+    assert not Category.objects.filter(updated_at__isnull=True).exists()
+    for post in Post.objects.all():
+        assert post.excerpt == make_excerpt(post.text), (
+            "Убедитесь, что анонс заполняется и при загрузке через loaddata."
+        )
+
+
+def test_forward_references_and_counts(tmp_path, user):
+    rows = [
+        {"model": "blog.comment", "pk": 7, "fields": {
+            "text": "Первый", "post": 3, "author": user.pk,
+            "created_at": "2023-01-01T00:00:00Z",
+        }},
+        {"model": "blog.post", "pk": 3, "fields": {
+            "title": "Пост", "text": "Текст поста", "author": user.pk,
+            "category": 2, "pub_date": "2023-01-01T00:00:00Z",
+            "is_published": True,
+        }},
+        {"model": "blog.category", "pk": 2, "fields": {
+            "title": "Категория", "description": "", "slug": "cat",
+            "is_published": True,
+        }},
+    ]
+    path = tmp_path / "fixture.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in rows))
+    call_command("bulk_loaddata", str(path), batch_size=1)
+    assert Comment.objects.get(pk=7).post_id == 3
+    assert Post.objects.get(pk=3).comment_count == 1, (
+        "Убедитесь, что счётчики комментариев пересчитываются после"
+        " загрузки."
+    )
+
+
+def test_export_round_trip(tmp_path, mixer, user,
+                           post_with_published_location):
+    mixer.cycle(3).blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    output = tmp_path / "blog.jsonl.gz"
+    call_command("export_blog", str(output))
+    snapshot = list(Comment.objects.values().order_by("pk"))
+    Comment.objects.all().delete()
+    call_command("bulk_loaddata", str(output))
+    assert list(Comment.objects.values().order_by("pk")) == snapshot
@@ -0,0 +1,39 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _count(post):
+    return Post.objects.values_list("comment_count", flat=True).get(
+        pk=post.pk
+    )
+
+
+def test_counter_follows_comments(mixer, post_with_published_location,
+                                  another_category, user):
+    post = post_with_published_location
+    other_post = mixer.blend("blog.Post", category=another_category)
+    comments = mixer.cycle(4).blend("blog.Comment", post=post, author=user)
+    assert _count(post) == 4
+
+    comments[0].delete()
+    assert _count(post) == 3
+
+    moved = Comment.objects.get(pk=comments[1].pk)
+    moved.post = other_post
+    moved.save()
+    assert (_count(post), _count(other_post)) == (2, 1)
+
+    Comment.objects.filter(post=post).delete()
+    assert _count(post) == 0
+
+
+def test_recount_command(mixer, post_with_published_location, user):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    Post.objects.update(comment_count=0)
+    call_command("recount_comments")
+    assert _count(post) == 3
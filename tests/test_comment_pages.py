@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.comments import COUNT_OF_COMMENTS
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_comments(mixer, user, post_with_published_location):
+    start = timezone.now() - timedelta(days=1)
+    comments = mixer.cycle(COUNT_OF_COMMENTS * 2 + 5).blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    for i, comment in enumerate(comments):
+        Comment.objects.filter(pk=comment.pk).update(
+            created_at=start + timedelta(minutes=i)
+        )
+    return [c.pk for c in comments]
+
+
+def test_detail_shows_first_chunk_and_loads_the_rest(
+        user_client, post_with_published_location, many_comments
+):
+    post = post_with_published_location
+    page = user_client.get(f"/posts/{post.id}/").context["comments"]
+    assert [c.pk for c in page] == many_comments[:COUNT_OF_COMMENTS]
+
+    loaded = []
+    cursor = page.next_cursor
+    while cursor:
+        response = user_client.get(
+            f"/posts/{post.id}/comments/", {"cursor": cursor}
+        )
+        assert response.status_code == 200
+        chunk = response.context["comments"]
+        loaded.extend(c.pk for c in chunk)
+        cursor = chunk.next_cursor
+    assert loaded == many_comments[COUNT_OF_COMMENTS:], (
+        "Убедитесь, что остальные комментарии подгружаются порциями"
+        " через `posts/<post_id>/comments/`."
+    )
+
+
+def test_new_comment_redirects_to_its_chunk(
+        user_client, post_with_published_location, many_comments
+):
+    post = post_with_published_location
+    response = user_client.post(
+        f"/posts/{post.id}/add_comment/", {"text": "Последний комментарий"}
+    )
+    new = Comment.objects.get(text="Последний комментарий")
+    assert response.status_code == 302
+    assert response.url.endswith(f"#comment_{new.pk}")
+    page = user_client.get(response.url).context["comments"]
+    assert new.pk in [c.pk for c in page], (
+        "Убедитесь, что после добавления комментария пользователь попадает"
+        " на порцию комментариев, где виден новый комментарий."
+    )
+
+
+def test_deleting_last_comment_of_chunk_redirects_to_previous(
+        user_client, post_with_published_location, many_comments
+):
+    post = post_with_published_location
+    *kept, last = many_comments[:COUNT_OF_COMMENTS * 2 + 1]
+    Comment.objects.filter(pk__in=many_comments[len(kept) + 1:]).delete()
+    response = user_client.post(
+        f"/posts/{post.id}/delete_comment/{last}/"
+    )
+    assert response.status_code == 302
+    assert not Comment.objects.filter(pk=last).exists()
+    page = user_client.get(response.url).context["comments"]
+    assert [c.pk for c in page] == kept[COUNT_OF_COMMENTS:], (
+        "Убедитесь, что после удаления единственного комментария последней"
+        " порции пользователь попадает на предыдущую, а не на пустую."
+    )
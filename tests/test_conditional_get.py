@@ -0,0 +1,127 @@
+import pytest
+from django.test import Client
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _revalidate(client, url, response):
+    return client.get(
+        url,
+        HTTP_IF_NONE_MATCH=response["ETag"],
+        HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+    )
+
+
+@pytest.fixture
+def urls(post_with_published_location):
+    post = post_with_published_location
+    return [
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    ]
+
+
+@pytest.mark.parametrize("client_name", ["user_client", "unlogged_client"])
+def test_unchanged_pages_are_not_modified(request, client_name, urls):
+    client = request.getfixturevalue(client_name)
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == 200
+        repeated = _revalidate(client, url, response)
+        assert repeated.status_code == 304, (
+            f"Убедитесь, что страница `{url}` отвечает 304 Not Modified,"
+            " если копия клиента актуальна."
+        )
+        assert repeated["ETag"] == response["ETag"]
+
+
+def test_changes_invalidate_validators(
+        mixer, user, unlogged_client, urls, post_with_published_location
+):
+    post = post_with_published_location
+    changes = [
+        lambda: mixer.blend("blog.Comment", post=post, author=user),
+        lambda: post.location.save(),
+        lambda: post.category.save(),
+        lambda: Post.objects.get(pk=post.pk).save(),
+        lambda: post.comments.first().delete(),
+    ]
+    for change in changes:
+        responses = {url: unlogged_client.get(url) for url in urls}
+        change()
+        for url, response in responses.items():
+            assert _revalidate(
+                unlogged_client, url, response
+            ).status_code == 200, (
+                f"Убедитесь, что после изменения контента страница `{url}`"
+                " отдаётся заново, а не как 304."
+            )
+
+
+def test_etag_depends_on_user(user_client, another_user_client, urls):
+    for url in urls:
+        response = user_client.get(url)
+        assert _revalidate(
+            another_user_client, url, response
+        ).status_code == 200, (
+            "Убедитесь, что ETag учитывает пользователя: страница содержит"
+            " персональные элементы."
+        )
+
+
+def test_comment_edit_touches_post(user, mixer, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    post.refresh_from_db()
+    before = post.updated_at
+    comment.text = "Исправленный комментарий"
+    comment.save()
+    post.refresh_from_db()
+    assert post.updated_at > before
+
+
+def test_etag_is_not_shared_between_pages(unlogged_client, urls):
+    index = unlogged_client.get("/")
+    etags = {unlogged_client.get(url)["ETag"] for url in urls}
+    assert len(etags) == len(urls), (
+        "Убедитесь, что у разных страниц разные ETag."
+    )
+    for url in ("/category/nope/", "/profile/nobody/",
+                "/category/nope/feed/rss/"):
+        response = unlogged_client.get(
+            url, HTTP_IF_NONE_MATCH=index["ETag"]
+        )
+        assert response.status_code == 404, (
+            f"Убедитесь, что `{url}` отвечает 404 даже с чужим ETag."
+        )
+
+
+def test_relogin_invalidates_pages_with_forms(
+        user, post_with_published_location
+):
+    user.set_password("password")
+    user.save()
+    client = Client(enforce_csrf_checks=True)
+
+    def login():
+        client.get("/auth/login/")
+        client.post("/auth/login/", {
+            "username": user.username, "password": "password",
+            "csrfmiddlewaretoken": client.cookies["csrftoken"].value,
+        })
+
+    url = f"/posts/{post_with_published_location.id}/"
+    login()
+    response = client.get(url)
+    client.get("/auth/logout/")
+    login()
+    repeated = _revalidate(client, url, response)
+    assert repeated.status_code == 200, (
+        "Убедитесь, что после повторного входа страница с формой отдаётся"
+        " заново: CSRF-токен в старой копии уже недействителен."
+    )
+    assert _revalidate(client, url, repeated).status_code == 304
@@ -0,0 +1,51 @@
+import pytest
+from django.core.management import call_command
+from django.db.models import F
+
+from blog.models import Category, Comment, FeedEntry, Location, Post, User
+
+pytestmark = [pytest.mark.django_db]
+
+MODELS = (User, Category, Location, Post, Comment)
+
+
+def _generate(seed):
+    call_command(
+        "generate_dataset", users=20, categories=4, locations=5, posts=200,
+        comments=1000, seed=seed, batch_size=64,
+    )
+    snapshot = {
+        model: list(model.objects.order_by("pk").values()) for model in MODELS
+    }
+    for model in reversed(MODELS):
+        model.objects.all().delete()
+    return snapshot
+
+
+def test_dataset_is_deterministic():
+    first = _generate(seed=1)
+    assert first == _generate(seed=1), (
+        "Убедитесь, что одинаковый seed даёт одинаковые данные."
+    )
+    assert first[Post] != _generate(seed=2)[Post]
+
+
+def test_dataset_shape():
+    call_command(
+        "generate_dataset", users=20, categories=4, locations=5, posts=500,
+        comments=5000, seed=3, future_share=0.1, unpublished_share=0.1,
+    )
+    posts = Post.objects.all()
+    assert posts.count() == 500
+    assert posts.filter(is_published=False).exists()
+    future = posts.filter(pub_date__gt=F("created_at"))
+    assert future.exists(), "Убедитесь, что есть отложенные публикации."
+    assert not Comment.objects.filter(post__in=future).exists()
+
+    counts = sorted(posts.values_list("comment_count", flat=True))
+    assert sum(counts) == Comment.objects.count()
+    assert sum(counts[-25:]) > sum(counts) / 2, (
+        "Убедитесь, что популярность публикаций неравномерна: 5% постов"
+        " должны собирать больше половины комментариев."
+    )
+    assert FeedEntry.objects.exists()
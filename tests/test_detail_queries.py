@@ -0,0 +1,31 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _detail_queries(client, post):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.parametrize("client_name", ["user_client", "unlogged_client"])
+def test_detail_queries_do_not_grow_with_comments(
+        request, client_name, mixer, post_with_published_location
+):
+    client = request.getfixturevalue(client_name)
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    few = _detail_queries(client, post)
+
+    mixer.cycle(30).blend("blog.Comment", post=post)
+    many = _detail_queries(client, post)
+    assert many == few, (
+        "Убедитесь, что число запросов к БД на странице публикации не"
+        " зависит от количества комментариев: авторов комментариев нужно"
+        f" загружать вместе с ними ({few} запросов для 2 комментариев,"
+        f" {many} для 32)."
+    )
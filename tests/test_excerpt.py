@@ -0,0 +1,39 @@
+import pytest
+from django.db import connection
+from django.template.defaultfilters import truncatewords
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_TEXT = " ".join(f"слово{i}" for i in range(200))
+
+
+def test_excerpt_is_computed_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save()
+    assert Post.objects.get(pk=post.pk).excerpt == truncatewords(
+        LONG_TEXT, 10
+    ), "Убедитесь, что анонс публикации пересчитывается при сохранении."
+
+    post.text = "Короткий текст"
+    post.save(update_fields=["text"])
+    assert Post.objects.get(pk=post.pk).excerpt == "Короткий текст"
+
+
+@pytest.mark.parametrize("url", ["/", "/category/{slug}/", "/profile/{user}/"])
+def test_lists_do_not_load_full_text(
+        client, user, post_with_published_location, url
+):
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save()
+    url = url.format(slug=post.category.slug, user=user.username)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert truncatewords(LONG_TEXT, 10) in response.content.decode()
+    assert not any(
+        '"blog_post"."text"' in query["sql"] for query in queries
+    ), "Убедитесь, что списки публикаций не загружают полный текст."
@@ -0,0 +1,57 @@
+import gzip
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _read(path):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as stream:
+        return [json.loads(line) for line in stream]
+
+
+def test_export_streams_all_models(
+        tmp_path, mixer, user, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post, author=user)
+    output = tmp_path / "blog.jsonl.gz"
+    with CaptureQueriesContext(connection) as queries:
+        call_command("export_blog", str(output), chunk_size=2)
+    rows = _read(output)
+    models = [row["model"] for row in rows]
+    assert models == sorted(models, key=[
+        "auth.user", "blog.category", "blog.location", "blog.post",
+        "blog.comment",
+    ].index), "Убедитесь, что модели выгружаются в порядке зависимостей."
+    assert models.count("blog.comment") == 5
+    exported_post = next(row for row in rows if row["model"] == "blog.post")
+    assert exported_post["pk"] == post.pk
+    assert exported_post["fields"]["author"] == post.author_id
+    assert exported_post["fields"]["image"] == post.image.name
+    assert exported_post["fields"]["pub_date"].startswith(
+        post.pub_date.strftime("%Y-%m-%dT%H:%M")
+    )
+    assert not any(
+        "LIMIT" not in query["sql"] and "blog_comment" in query["sql"]
+        and query["sql"].startswith("SELECT")
+        for query in queries
+    ), "Убедитесь, что выгрузка читает записи порциями с LIMIT."
+
+
+def test_export_resumes_after_id(tmp_path, mixer, user,
+                                 post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(4).blend("blog.Comment", post=post, author=user)
+    output = tmp_path / "blog.jsonl"
+    output.write_text("")
+    call_command(
+        "export_blog", str(output), resume=f"blog.comment:{comments[1].pk}"
+    )
+    rows = _read(output)
+    assert [row["pk"] for row in rows] == [c.pk for c in comments[2:]]
@@ -0,0 +1,45 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import FeedEntry
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _feed_ids():
+    return set(FeedEntry.objects.values_list("post_id", flat=True))
+
+
+def test_feed_follows_post_and_category(post_with_published_location):
+    post = post_with_published_location
+    assert _feed_ids() == {post.id}
+
+    post.is_published = False
+    post.save()
+    assert _feed_ids() == set()
+
+    post.is_published = True
+    post.save()
+    category = post.category
+    category.is_published = False
+    category.save()
+    assert _feed_ids() == set(), (
+        "Убедитесь, что публикации скрытой категории убираются из ленты."
+    )
+
+    category.is_published = True
+    category.save()
+    assert _feed_ids() == {post.id}
+
+    category.delete()
+    assert _feed_ids() == set()
+
+
+def test_rebuild_feed_command(post_with_published_location):
+    FeedEntry.objects.all().delete()
+    call_command("rebuild_feed")
+    entry = FeedEntry.objects.get()
+    post = post_with_published_location
+    assert (entry.post_id, entry.pub_date, entry.author_id) == (
+        post.id, post.pub_date, post.author_id
+    )
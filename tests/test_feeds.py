@@ -0,0 +1,112 @@
+from xml.dom import minidom
+
+import pytest
+
+from blog import syndication
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _content(response):
+    if response.streaming:
+        return b"".join(response.streaming_content).decode()
+    return response.content.decode()
+
+
+@pytest.fixture
+def feed_urls(post_with_published_location):
+    post = post_with_published_location
+    return [
+        "/feed/{}/",
+        f"/category/{post.category.slug}/feed/{{}}/",
+        f"/profile/{post.author.username}/feed/{{}}/",
+    ]
+
+
+@pytest.mark.parametrize("feed_type", ["rss", "atom"])
+def test_feeds_list_visible_posts(
+        client, feed_type, feed_urls, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    hidden = mixer.blend(
+        "blog.Post", author=post.author, category=post.category,
+        is_published=False,
+    )
+    for url in feed_urls:
+        response = client.get(url.format(feed_type))
+        assert response.status_code == 200
+        assert response.streaming, (
+            "Убедитесь, что лента отдаётся потоком."
+        )
+        content = _content(response)
+        minidom.parseString(content)
+        assert f"/posts/{post.id}/" in content
+        assert f"/posts/{hidden.id}/" not in content, (
+            "Убедитесь, что в ленту попадают только видимые публикации."
+        )
+
+
+@pytest.mark.parametrize("feed_type", ["rss", "atom"])
+def test_streamed_feed_matches_feedgenerator(
+        feed_type, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(25).blend(
+        "blog.Post", author=post.author, category=post.category,
+        is_published=True,
+    )
+    posts = Post.objects.order_by("pk")
+    feed_kwargs = {
+        "title": "Блогикум",
+        "link": "http://testserver/",
+        "description": "Новые публикации",
+        "last_modified": post.updated_at,
+    }
+
+    def make_item(item):
+        return {
+            "title": item.title,
+            "link": f"http://testserver/posts/{item.id}/",
+            "description": item.excerpt,
+            "pubdate": item.pub_date,
+        }
+
+    streamed = "".join(
+        syndication.stream(feed_type, posts, make_item, **feed_kwargs)
+    )
+    feed = syndication.make_feed(feed_type, **feed_kwargs)
+    for item in posts:
+        feed.add_item(**make_item(item))
+    assert streamed == feed.writeString("utf-8"), (
+        "Убедитесь, что лента, собранная по частям, совпадает с"
+        " документом feedgenerator."
+    )
+    items = minidom.parseString(streamed).getElementsByTagName(
+        "item" if feed_type == "rss" else "entry"
+    )
+    assert len(items) == 26
+
+
+def test_feed_is_cached_and_revalidated(
+        client, post_with_published_location, django_assert_num_queries
+):
+    first = client.get("/feed/atom/")
+    content = _content(first)
+    with django_assert_num_queries(0):
+        second = client.get("/feed/atom/")
+        assert second.content.decode() == content
+        not_modified = client.get(
+            "/feed/atom/", HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+    assert not_modified.status_code == 304
+
+    post = post_with_published_location
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in _content(client.get("/feed/atom/"))
+
+
+def test_unknown_feed_type_is_not_found(client, feed_urls):
+    for url in feed_urls:
+        assert client.get(url.format("json")).status_code == 404
@@ -0,0 +1,64 @@
+import pytest
+from django.template.loader import get_template
+
+from blog import fragments
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _card(post):
+    return fragments.render_card(Post.objects.get(pk=post.pk))
+
+
+def test_card_is_cached_until_dependency_changes(
+        mixer, user, post_with_published_location
+):
+    post = post_with_published_location
+    first = _card(post)
+    assert fragments.card_key(post) == fragments.card_key(
+        Post.objects.get(pk=post.pk)
+    )
+    assert _card(post) == first
+
+    category = post.category
+    category.title = "Новое название категории"
+    category.save()
+    assert category.title in _card(post), (
+        "Убедитесь, что карточка перерисовывается после изменения категории."
+    )
+
+    location = post.location
+    location.name = "Новое место"
+    location.save()
+    assert location.name in _card(post)
+
+    author = post.author
+    author.username = "renamed_author"
+    author.save()
+    assert "@renamed_author" in _card(post)
+
+    mixer.blend("blog.Comment", post=post, author=user)
+    assert "Комментарии (1)" in _card(post)
+
+
+def test_batch_cards_match_single_render(mixer, post_with_published_location):
+    other = mixer.blend(
+        "blog.Post", category=post_with_published_location.category,
+        location=None, is_published=True,
+    )
+    posts = list(Post.objects.filter(pk__in=[
+        post_with_published_location.pk, other.pk
+    ]).order_by("pk"))
+    expected = [
+        get_template(fragments.CARD_TEMPLATE).render({"post": post})
+        for post in posts
+    ]
+    assert fragments.render_cards(posts) == expected, (
+        "Убедитесь, что пакетная отрисовка даёт тот же HTML, что и"
+        " шаблон карточки."
+    )
+    assert [fragments.render_card(post) for post in posts] == expected
+    assert fragments.card_keys(posts) == [
+        fragments.card_key(post) for post in posts
+    ]
@@ -0,0 +1,54 @@
+import pytest
+from django.urls import NoReverseMatch, reverse, set_script_prefix
+
+from blog import links
+
+CASES = (
+    ("blog:index", (), {}),
+    ("blog:post_detail", (5,), {}),
+    ("blog:post_detail", (), {"post_id": 12}),
+    ("blog:post_detail", ("7",), {}),
+    ("blog:edit_comment", (3, 40), {}),
+    ("blog:delete_comment", (), {"post_id": 3, "comment_id": 40}),
+    ("blog:category_posts", ("travel-2023",), {}),
+    ("blog:profile", ("user.name+1@mail",), {}),
+    ("blog:profile", ("юзер",), {}),
+    ("blog:profile_feed", (), {"username": "a b", "feed_type": "rss"}),
+    ("pages:about", (), {}),
+)
+
+
+@pytest.mark.parametrize("name,args,kwargs", CASES)
+def test_url_matches_reverse(name, args, kwargs):
+    expected = reverse(name, args=args or None, kwargs=kwargs or None)
+    assert links.url(name, *args, **kwargs) == expected, (
+        "Убедитесь, что быстрый адрес совпадает с результатом reverse()."
+    )
+
+
+def test_url_respects_script_prefix():
+    set_script_prefix("/blog app/")
+    try:
+        assert links.url("blog:post_detail", 1) == reverse(
+            "blog:post_detail", args=[1]
+        )
+    finally:
+        set_script_prefix("/")
+
+
+@pytest.mark.parametrize("name,args", (
+    ("blog:post_detail", ("abc",)),
+    ("blog:post_detail", (1, 2)),
+    ("blog:category_posts", ("not a slug",)),
+    ("blog:missing", ()),
+))
+def test_invalid_arguments_raise_like_reverse(name, args):
+    with pytest.raises(NoReverseMatch):
+        links.url(name, *args)
+
+
+def test_blog_routes_are_precompiled():
+    names = [name for name, _, _ in CASES if name.startswith("blog:")]
+    assert all(links._route(name) is not None for name in names), (
+        "Убедитесь, что маршруты блога собираются без reverse()."
+    )
@@ -0,0 +1,57 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _lookups(client, url, condition):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [
+        query["sql"] for query in queries
+        if query["sql"].startswith("SELECT") and condition in query["sql"]
+    ]
+
+
+@pytest.mark.parametrize(
+    "url, condition",
+    [
+        ("/posts/{post.id}/edit/", 'WHERE "blog_post"."id" = {post.id}'),
+        ("/posts/{post.id}/", 'WHERE "blog_post"."id" = {post.id}'),
+        (
+            "/category/{post.category.slug}/",
+            'WHERE ("blog_category"."is_published" AND'
+            ' "blog_category"."slug" = ',
+        ),
+        (
+            "/profile/{post.author.username}/",
+            'WHERE "auth_user"."username" = ',
+        ),
+    ],
+)
+def test_object_is_loaded_once_per_request(
+        user_client, post_with_published_location, url, condition
+):
+    post = post_with_published_location
+    lookups = _lookups(
+        user_client, url.format(post=post), condition.format(post=post)
+    )
+    assert len(lookups) == 1, (
+        "Убедитесь, что объект страницы загружается из БД один раз за"
+        f" запрос, а не при каждом вызове get_object(): {lookups}"
+    )
+
+
+def test_author_check_does_not_load_author(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    lookups = _lookups(
+        user_client, f"/posts/{post.id}/edit/", 'FROM "auth_user" WHERE'
+    )
+    assert len(lookups) == 1, (
+        "Убедитесь, что проверка авторства сравнивает author_id и не"
+        " загружает автора публикации отдельным запросом."
+    )
@@ -0,0 +1,53 @@
+import pytest
+from django.core.cache import cache
+
+from blog import page_cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_feed_is_served_from_cache(
+        unlogged_client, post_with_published_location,
+        django_assert_num_queries
+):
+    first = unlogged_client.get("/")
+    with django_assert_num_queries(0):
+        second = unlogged_client.get("/")
+    assert second.content == first.content
+
+
+def test_content_change_invalidates_page(
+        unlogged_client, post_with_published_location
+):
+    unlogged_client.get("/")
+    post = post_with_published_location
+    post.title = "Совсем новый заголовок"
+    post.save()
+    assert post.title in unlogged_client.get("/").content.decode(), (
+        "Убедитесь, что изменение публикации сбрасывает кеш страниц ленты."
+    )
+
+
+def test_logged_in_user_is_not_cached(
+        user_client, post_with_published_location
+):
+    user_client.get("/")
+    assert user_client.get("/").context is not None
+
+
+def test_concurrent_miss_serves_stale_copy(
+        rf, unlogged_client, post_with_published_location,
+        django_assert_num_queries
+):
+    stale = unlogged_client.get("/").content
+    post = post_with_published_location
+    post.title = "Новый заголовок"
+    post.save()
+    key, version = page_cache.page_key(rf.get("/"))
+    cache.add(f"{key}:lock", version, 10)
+    try:
+        with django_assert_num_queries(0):
+            response = unlogged_client.get("/")
+    finally:
+        cache.delete(f"{key}:lock")
+    assert response.content == stale
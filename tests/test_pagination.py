@@ -0,0 +1,178 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import counts, paginators, tasks
+from blog.views import get_filtered_qs
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def same_time_posts(mixer, user, published_category):
+    pub_date = timezone.now() - timedelta(days=1)
+    return mixer.cycle(N_PER_PAGE * 2 + 3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=pub_date,
+    )
+
+
+def _walk(client, url, cursor_attr):
+    seen = []
+    cursor = None
+    while True:
+        data = {"cursor": cursor} if cursor else {}
+        page_obj = client.get(url, data).context["page_obj"]
+        seen.extend(post.id for post in page_obj)
+        cursor = getattr(page_obj, cursor_attr)
+        if cursor is None:
+            return seen, page_obj
+
+
+@pytest.mark.parametrize("url", ["/", "/category/{slug}/", "/profile/{user}/"])
+def test_cursor_walk_covers_feed(
+        url, user_client, user, published_category, same_time_posts
+):
+    url = url.format(slug=published_category.slug, user=user.username)
+    forward, last_page = _walk(user_client, url, "next_cursor")
+    expected = sorted(
+        (post.id for post in same_time_posts), reverse=True
+    )
+    assert forward == expected, (
+        "Убедитесь, что курсорная пагинация обходит все публикации ленты"
+        " ровно один раз и в порядке «от новых к старым»."
+    )
+    assert not last_page.has_next()
+    assert len(last_page) == len(same_time_posts) % N_PER_PAGE
+
+
+def test_cursor_walk_backwards(user_client, same_time_posts):
+    second = user_client.get("/", {
+        "cursor": user_client.get("/").context["page_obj"].next_cursor
+    }).context["page_obj"]
+    first = user_client.get(
+        "/", {"cursor": second.previous_cursor}
+    ).context["page_obj"]
+    expected = sorted(
+        (post.id for post in same_time_posts), reverse=True
+    )[:N_PER_PAGE]
+    assert [post.id for post in first] == expected
+    assert not first.has_previous()
+
+
+def test_invalid_cursor_is_not_found(user_client):
+    response = user_client.get("/", {"cursor": "not-a-cursor"})
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("moment", [5, 1.5, True])
+def test_numeric_cursor_on_date_feed_is_not_found(
+        client, post_with_published_location, moment
+):
+    post = post_with_published_location
+    cursor = paginators.encode_cursor(paginators.FORWARD, moment, 1)
+    for url in ("/", f"/category/{post.category.slug}/",
+                f"/profile/{post.author.username}/"):
+        response = client.get(url, {"cursor": cursor})
+        assert response.status_code == 404, (
+            f"Убедитесь, что числовой курсор на `{url}` даёт 404, а не 500."
+        )
+
+
+@pytest.fixture
+def windowed(settings, monkeypatch):
+    settings.POSTS_PAGINATION_MODE = "windowed"
+    refreshes = []
+    monkeypatch.setattr(
+        tasks, "run", lambda func, *args: refreshes.append(args)
+    )
+    return refreshes
+
+
+def _index_count_key():
+    return counts.queryset_key(
+        "/", get_filtered_qs(is_hidden=True, is_comment=True)
+    )
+
+
+def test_windowed_page_uses_bounded_estimate(
+        windowed, user_client, same_time_posts
+):
+    with CaptureQueriesContext(connection) as queries:
+        page_obj = user_client.get("/", {"page": 2}).context["page_obj"]
+    assert not any(
+        query["sql"].startswith("SELECT COUNT(*)")
+        and "LIMIT" not in query["sql"]
+        for query in queries
+    ), "Убедитесь, что точный COUNT(*) не выполняется при запросе страницы."
+    assert len(windowed) == 1, (
+        "Убедитесь, что точное число строк пересчитывается в фоне."
+    )
+    assert page_obj.number == 2 and page_obj.has_next()
+    assert page_obj.last_page_number == 3
+    assert list(page_obj.page_window) == [1, 2, 3]
+
+    counts.refresh(*windowed[0])
+    total, _ = cache.get(_index_count_key())
+    assert total == len(same_time_posts)
+
+
+def test_windowed_page_uses_cached_count(
+        windowed, user_client, same_time_posts
+):
+    cache.set(
+        _index_count_key(), (N_PER_PAGE * 50, 0), counts.COUNT_TIMEOUT
+    )
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get("/", {"page": 2})
+    page_obj = response.context["page_obj"]
+    assert not any("COUNT" in query["sql"] for query in queries), (
+        "Убедитесь, что число страниц берётся из сохранённого значения."
+    )
+    assert windowed, (
+        "Убедитесь, что устаревшее число строк пересчитывается в фоне."
+    )
+    assert page_obj.last_page_number == 50
+    assert list(page_obj.page_window) == [1, 2, 3, 4]
+    assert response.content.decode().count('class="page-item') < 10, (
+        "Убедитесь, что выводится только окно ссылок на страницы."
+    )
+
+
+def test_windowed_page_past_end_is_not_found(
+        windowed, user_client, same_time_posts
+):
+    assert user_client.get("/", {"page": 4}).status_code == 404
+
+
+def test_windowed_profile_counts_owner_and_visitors_apart(
+        windowed, user, user_client, unlogged_client, mixer,
+        published_category
+):
+    pub_date = timezone.now() - timedelta(days=1)
+    mixer.cycle(N_PER_PAGE * 4).blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=pub_date, is_published=(
+            index < 5 for index in range(N_PER_PAGE * 4)
+        ),
+    )
+    url = f"/profile/{user.username}/"
+    owner_page = user_client.get(url).context["page_obj"]
+    for args in windowed:
+        counts.refresh(*args)
+    assert owner_page.paginator.count == N_PER_PAGE * 4
+
+    visitor_page = unlogged_client.get(url).context["page_obj"]
+    assert visitor_page.last_page_number == 1, (
+        "Убедитесь, что число страниц профиля для гостей не берётся"
+        " из счётчика владельца."
+    )
+    assert unlogged_client.get(url, {"page": 4}).status_code == 404
@@ -0,0 +1,253 @@
+"""Бюджеты запросов и времени для всех маршрутов блога.
+
+Каждый маршрут из blog/urls.py и pages/urls.py запрашивается через
+тестовый клиент на сгенерированных данных; число запросов, время в
+базе, время отрисовки шаблонов и полное время ответа сравниваются
+с tests/perf_baseline.json.
+
+По умолчанию данные небольшие и проверяется только число запросов:
+оно не зависит ни от объёма данных, ни от машины. С BLOGICUM_PERF=1
+данные генерируются в полном объёме и проверяется ещё и время.
+BLOGICUM_PERF_UPDATE=1 перезаписывает эталон текущими замерами.
+"""
+import json
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.template.backends.django import Template
+from django.urls import URLPattern, URLResolver, reverse
+from django.utils import timezone
+
+from blog import tasks
+from blog.models import Comment, Post, User
+from blog.urls import urlpatterns as blog_urlpatterns
+from pages.urls import urlpatterns as pages_urlpatterns
+
+pytestmark = [pytest.mark.django_db]
+
+BASELINE = Path(__file__).parent / "perf_baseline.json"
+FULL = os.environ.get("BLOGICUM_PERF") == "1"
+UPDATE = os.environ.get("BLOGICUM_PERF_UPDATE") == "1"
+
+DATASET = dict(
+    users=1000, categories=20, locations=200, posts=20_000,
+    comments=200_000, seed=0,
+) if FULL else dict(
+    users=20, categories=4, locations=5, posts=300, comments=1500, seed=0,
+)
+ROUNDS = 5 if FULL else 1
+QUERY_TOLERANCE = 0
+TIME_TOLERANCE = 0.5
+TIME_SLACK_MS = 5.0
+TIMINGS = ("db_ms", "render_ms", "wall_ms")
+
+
+def _route_names(patterns, namespace):
+    names = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            names |= _route_names(pattern.url_patterns, namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.add(f"{namespace}:{pattern.name}")
+    return names
+
+
+ROUTES = (
+    _route_names(blog_urlpatterns, "blog")
+    | _route_names(pages_urlpatterns, "pages")
+)
+
+
+class Probe:
+    """Копит число и время запросов к базе и время отрисовки шаблонов."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.render = 0.0
+        self._depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    @contextmanager
+    def rendering(self, monkeypatch):
+        render = Template.render
+        probe = self
+
+        def timed(template, *args, **kwargs):
+            # Вложенные отрисовки (карточки постов) уже входят во внешнюю.
+            probe._depth += 1
+            started = time.perf_counter()
+            try:
+                return render(template, *args, **kwargs)
+            finally:
+                probe._depth -= 1
+                if not probe._depth:
+                    probe.render += time.perf_counter() - started
+
+        monkeypatch.setattr(Template, "render", timed)
+        try:
+            yield
+        finally:
+            monkeypatch.setattr(Template, "render", render)
+
+
+def _measure(client, url, monkeypatch):
+    cache.clear()
+    probe = Probe()
+    with probe.rendering(monkeypatch), connection.execute_wrapper(probe):
+        started = time.perf_counter()
+        response = client.get(url)
+        if response.streaming:
+            b"".join(response.streaming_content)
+        wall = time.perf_counter() - started
+    assert response.status_code == 200, (
+        f"Убедитесь, что страница `{url}` открывается без ошибок."
+    )
+    return {
+        "queries": probe.queries,
+        "db_ms": probe.db * 1000,
+        "render_ms": probe.render * 1000,
+        "wall_ms": wall * 1000,
+    }
+
+
+def _scenarios(dataset_clients):
+    """Маршрут -> (клиент, аргументы адреса, строка запроса)."""
+    anonymous, author_client, commenter_client, data = dataset_clients
+    post, comment = data["post"], data["comment"]
+    on_post = {"post_id": post.pk}
+    on_comment = {"post_id": post.pk, "comment_id": comment.pk}
+    category = {"category_slug": post.category.slug}
+    profile = {"username": post.author.username}
+    return {
+        "blog:index": (anonymous, {}, ""),
+        "blog:index_feed": (anonymous, {"feed_type": "rss"}, ""),
+        "blog:search": (anonymous, {}, f"q={post.title.split()[0]}"),
+        "blog:category_posts": (anonymous, category, ""),
+        "blog:category_feed": (
+            anonymous, {**category, "feed_type": "atom"}, ""
+        ),
+        "blog:profile": (anonymous, profile, ""),
+        "blog:profile_feed": (
+            anonymous, {**profile, "feed_type": "rss"}, ""
+        ),
+        "blog:post_detail": (anonymous, on_post, ""),
+        "blog:comments": (anonymous, on_post, ""),
+        "blog:create_post": (author_client, {}, ""),
+        "blog:edit_post": (author_client, on_post, ""),
+        "blog:delete_post": (author_client, on_post, ""),
+        "blog:edit_profile": (author_client, {}, ""),
+        "blog:add_comment": (author_client, on_post, ""),
+        "blog:edit_comment": (commenter_client, on_comment, ""),
+        "blog:delete_comment": (commenter_client, on_comment, ""),
+        "pages:about": (anonymous, {}, ""),
+        "pages:rules": (anonymous, {}, ""),
+    }
+
+
+@pytest.fixture
+def dataset_clients(client, monkeypatch):
+    monkeypatch.setattr(tasks, "run", lambda func, *args: func(*args))
+    call_command("generate_dataset", **DATASET)
+    post = Post.objects.filter(
+        is_published=True, category__is_published=True,
+        pub_date__lte=timezone.now(),
+    ).order_by("-comment_count").first()
+    comment = Comment.objects.filter(post=post).order_by("pk").first()
+    assert post is not None and comment is not None
+    author_client = type(client)()
+    author_client.force_login(post.author)
+    commenter_client = type(client)()
+    commenter_client.force_login(User.objects.get(pk=comment.author_id))
+    data = {"post": post, "comment": comment}
+    return client, author_client, commenter_client, data
+
+
+def _load_baseline():
+    if not BASELINE.exists():
+        return {}
+    return json.loads(BASELINE.read_text(encoding="utf-8"))
+
+
+def _summarize(samples):
+    result = {"queries": max(sample["queries"] for sample in samples)}
+    for name in TIMINGS:
+        result[name] = round(
+            statistics.median(sample[name] for sample in samples), 2
+        )
+    return result
+
+
+def _regressions(name, measured, budget):
+    found = []
+    allowed = budget["queries"] + QUERY_TOLERANCE
+    if measured["queries"] > allowed:
+        found.append(
+            f"{name}: {measured['queries']} запросов вместо {allowed}"
+        )
+    if FULL:
+        for key in TIMINGS:
+            limit = budget[key] * (1 + TIME_TOLERANCE) + TIME_SLACK_MS
+            if measured[key] > limit:
+                found.append(
+                    f"{name}: {key} = {measured[key]:.1f}"
+                    f" при бюджете {limit:.1f}"
+                )
+    return found
+
+
+def test_views_stay_within_budget(dataset_clients, monkeypatch):
+    scenarios = _scenarios(dataset_clients)
+    assert ROUTES == set(scenarios), (
+        "Убедитесь, что для каждого маршрута blog и pages задан сценарий"
+        " в tests/test_performance.py."
+    )
+    measured = {}
+    for name, (client, kwargs, query) in sorted(scenarios.items()):
+        url = reverse(name, kwargs=kwargs) + (f"?{query}" if query else "")
+        measured[name] = _summarize([
+            _measure(client, url, monkeypatch) for _ in range(ROUNDS)
+        ])
+
+    baseline = _load_baseline()
+    if UPDATE:
+        views = baseline.get("views", {})
+        for name, values in measured.items():
+            if not FULL and name in views:
+                values = {**views[name], "queries": values["queries"]}
+            views[name] = values
+        dataset = DATASET if FULL else baseline.get("dataset", DATASET)
+        BASELINE.write_text(json.dumps(
+            {"dataset": dataset, "views": views},
+            ensure_ascii=False, indent=2, sort_keys=True,
+        ) + "\n", encoding="utf-8")
+        return
+
+    budgets = baseline.get("views", {})
+    missing = sorted(set(measured) - set(budgets))
+    assert not missing, (
+        "Для маршрутов нет бюджета в tests/perf_baseline.json: "
+        f"{', '.join(missing)}. Запустите тесты с BLOGICUM_PERF_UPDATE=1."
+    )
+    regressions = [
+        problem
+        for name, values in measured.items()
+        for problem in _regressions(name, values, budgets[name])
+    ]
+    assert not regressions, (
+        "Производительность страниц ухудшилась:\n" + "\n".join(regressions)
+    )
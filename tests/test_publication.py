@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog import publication
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+
+
+def test_scheduled_post_goes_live_without_restart(
+        monkeypatch, unlogged_client, scheduled_post
+):
+    assert scheduled_post not in unlogged_client.get("/").context["page_obj"]
+
+    later = scheduled_post.pub_date + timedelta(seconds=1)
+    monkeypatch.setattr(publication, "now", lambda: later)
+    assert scheduled_post in unlogged_client.get("/").context["page_obj"], (
+        "Убедитесь, что отложенная публикация появляется в ленте после"
+        " наступления даты публикации без перезапуска сервера."
+    )
+
+
+def test_next_publication_bounds_cache_timeout(scheduled_post):
+    publication.reset()
+    assert publication.next_publication() == scheduled_post.pub_date
+    assert 3590 < publication.cache_timeout(24 * 60 * 60) <= 3600
+
+    scheduled_post.pub_date = timezone.now() - timedelta(minutes=1)
+    scheduled_post.save()
+    assert publication.next_publication() is None
+    assert publication.cache_timeout(300) == 300
+
+
+def test_tick_state_expires(monkeypatch, scheduled_post):
+    timeouts = {}
+    store = publication.cache.set
+
+    def record(key, value, timeout=None, *args, **kwargs):
+        timeouts[key] = timeout
+        return store(key, value, timeout, *args, **kwargs)
+
+    monkeypatch.setattr(publication.cache, "set", record)
+    for pub_date in (
+            timezone.now() + timedelta(days=1),
+            timezone.now() - timedelta(minutes=1),
+    ):
+        scheduled_post.pub_date = pub_date
+        scheduled_post.save()
+        publication.tick()
+        assert 0 < timeouts[publication.DUE_KEY] <= (
+            publication.NOTHING_SCHEDULED_TIMEOUT
+        ), (
+            "Убедитесь, что момент следующей публикации кешируется на"
+            " конечное время: её могли запланировать в другом процессе."
+        )
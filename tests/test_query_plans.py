@@ -0,0 +1,113 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory
+from django.utils import timezone
+
+from blog import comments, feed
+from blog.models import Comment, Post
+from blog.paginators import FORWARD, CursorPaginator, encode_cursor
+from blog.views import CategoryPostsView, IndexView, ProfileListView
+from conftest import N_PER_PAGE
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="План запроса проверяется для SQLite.",
+    ),
+]
+
+N_POSTS = 300
+
+
+def _view(view_class, user, **kwargs):
+    request = RequestFactory().get("/")
+    request.user = user
+    view = view_class()
+    view.setup(request, **kwargs)
+    return view
+
+
+@pytest.fixture
+def feed_data(mixer):
+    users = mixer.cycle(3).blend(get_user_model())
+    categories = mixer.cycle(3).blend("blog.Category", is_published=True)
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            title=f"Пост {i}",
+            text="Текст",
+            author=users[i % 3],
+            category=categories[i % 3],
+            pub_date=now + timedelta(hours=10 - i),
+            is_published=bool(i % 5),
+        )
+        for i in range(N_POSTS)
+    )
+    feed.rebuild()
+    post = Post.objects.first()
+    Comment.objects.bulk_create(
+        Comment(post=post, author=users[0], text="Комментарий")
+        for _ in range(30)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return users, categories, post
+
+
+@pytest.fixture
+def plans(feed_data):
+    users, categories, post = feed_data
+    querysets = {
+        "index": _view(IndexView, users[1]),
+        "category": _view(
+            CategoryPostsView, users[1], category_slug=categories[0].slug
+        ),
+        "public_profile": _view(
+            ProfileListView, users[1], username=users[0].username
+        ),
+        "own_profile": _view(
+            ProfileListView, users[0], username=users[0].username
+        ),
+    }
+    middle = Post.objects.order_by("-pub_date")[N_POSTS // 2]
+    cursor = encode_cursor(FORWARD, middle.pub_date, middle.pk)
+    plans = {}
+    for name, view in querysets.items():
+        paginator = CursorPaginator(view.get_queryset(), N_PER_PAGE)
+        plans[name] = paginator.get_queryset().explain()
+        plans[f"{name}_deep"] = paginator.get_queryset(cursor).explain()
+    paginator = CursorPaginator(
+        comments.post_comments(post.id), comments.COUNT_OF_COMMENTS
+    )
+    first = paginator.page()
+    plans["comments"] = paginator.get_queryset().explain()
+    plans["comments_deep"] = paginator.get_queryset(
+        first.next_cursor
+    ).explain()
+    return plans
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "index", "index_deep",
+        "category", "category_deep",
+        "public_profile", "public_profile_deep",
+        "own_profile", "own_profile_deep",
+        "comments", "comments_deep",
+    ],
+)
+def test_view_query_uses_index(plans, name):
+    plan = plans[name]
+    assert re.search(r"USING (COVERING )?INDEX", plan), (
+        f"Запрос `{name}` должен выбирать строки по индексу:\n{plan}"
+    )
+    assert "TEMP B-TREE" not in plan, (
+        f"Запрос `{name}` не должен сортировать во временном B-дереве:\n"
+        f"{plan}"
+    )
@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from blog import search
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make(title="Заметка", text="обычный текст", **kwargs):
+        fields = {
+            "author": user,
+            "category": published_category,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+        }
+        fields.update(kwargs)
+        return mixer.blend("blog.Post", title=title, text=text, **fields)
+    return make
+
+
+def _found(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    assert response.status_code == 200
+    return response.context["page_obj"]
+
+
+def test_search_ranks_visible_posts(client, make_post, mixer):
+    weak = make_post(text="про кота и собаку")
+    strong = make_post(title="Кот", text="кот кот кот")
+    make_post(text="кот", is_published=False)
+    make_post(text="кот", pub_date=timezone.now() + timedelta(days=1))
+    make_post(
+        text="кот",
+        category=mixer.blend("blog.Category", is_published=False),
+    )
+    make_post(text="про собаку")
+    found = [post.id for post in _found(client, "кот")]
+    assert found == [strong.id, weak.id], (
+        "Убедитесь, что поиск находит только видимые публикации и"
+        " выводит более релевантные первыми."
+    )
+
+
+def test_index_follows_post_changes(client, make_post):
+    post = make_post(text="старое содержание")
+    post.text = "новое содержание"
+    post.save()
+    assert [p.id for p in _found(client, "новое")] == [post.id]
+    assert not _found(client, "старое")
+
+    post.delete()
+    assert not _found(client, "новое")
+
+
+def test_search_results_are_cursor_paginated(client, make_post):
+    posts = [make_post(text="кот") for _ in range(N_PER_PAGE + 3)]
+    page_obj = _found(client, "кот")
+    response = client.get(
+        "/search/", {"q": "кот", "cursor": page_obj.next_cursor}
+    )
+    assert "?q=%D0%BA%D0%BE%D1%82&amp;cursor=" in response.content.decode()
+    second = response.context["page_obj"]
+    found = [post.id for post in page_obj] + [post.id for post in second]
+    assert sorted(found) == sorted(post.id for post in posts)
+    assert not second.has_next()
+
+
+@pytest.mark.parametrize("query", ['"', "кот AND (", "NEAR(", ""])
+def test_search_tolerates_any_input(client, make_post, query):
+    make_post(text="кот")
+    assert _found(client, query) is not None
+
+
+def test_rebuild_search_command(client, make_post):
+    posts = [make_post(text=f"слово{i} общий") for i in range(5)]
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {search.TABLE}")
+        cursor.execute(
+            f"INSERT INTO {search.TABLE}(rowid, title, text)"
+            " VALUES (100500, 'сирота', 'общий')"
+        )
+    call_command("rebuild_search", chunk_size=2)
+    found = [post.id for post in _found(client, "общий")]
+    assert sorted(found) == sorted(post.id for post in posts)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {search.TABLE}")
+        assert cursor.fetchone()[0] == len(posts)
@@ -0,0 +1,55 @@
+import json
+import re
+
+import pytest
+from django.core.cache import cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _timing(response):
+    return dict(
+        (part.split(";", 1)[0], part)
+        for part in response["Server-Timing"].split(", ")
+    )
+
+
+def test_server_timing_header_and_log(
+        client, settings, caplog, post_with_published_location
+):
+    settings.PERFORMANCE_SAMPLE_RATE = 1
+    cache.clear()
+    with caplog.at_level("INFO", logger="blogicum.performance"):
+        first = client.get("/")
+        second = client.get("/")
+
+    timing = _timing(first)
+    assert set(timing) == {"sql", "render", "cache", "total"}, (
+        "Убедитесь, что ответ содержит заголовок Server-Timing с временем"
+        " SQL, отрисовки, обращениями к кешу и общим временем."
+    )
+    queries = int(re.search(r'desc="(\d+) queries"', timing["sql"])[1])
+    assert queries > 0
+    assert "hits=0" not in _timing(second)["cache"], (
+        "Убедитесь, что попадания в кеш страниц учитываются."
+    )
+
+    records = [
+        json.loads(record.getMessage()) for record in caplog.records
+        if record.name == "blogicum.performance"
+    ]
+    assert len(records) == 2
+    assert records[0]["view"] == "blog:index"
+    assert records[0]["sql_count"] == queries
+    assert records[0]["caches"]["page.miss"] == 1
+    assert records[0]["render_ms"] > 0, (
+        "Убедитесь, что учитывается отрисовка страниц, попадающих в кеш."
+    )
+    assert records[1]["caches"]["page.hit"] == 1
+    assert records[1]["sql_count"] < queries
+
+
+def test_unsampled_requests_are_not_measured(client, settings):
+    settings.PERFORMANCE_SAMPLE_RATE = 0
+    response = client.get("/")
+    assert "Server-Timing" not in response
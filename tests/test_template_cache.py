@@ -0,0 +1,143 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.template.backends.django import DjangoTemplates
+from django.template.loader import render_to_string
+
+from blogicum import settings
+from core import template_loaders
+
+pytestmark = [pytest.mark.django_db]
+
+TEMPLATES_DIR = Path(settings.TEMPLATES_DIR)
+
+
+def _import_prod():
+    sys.modules.pop("blogicum.settings_prod", None)
+    return importlib.import_module("blogicum.settings_prod")
+
+
+@pytest.fixture
+def settings_prod(monkeypatch):
+    monkeypatch.setenv("DJANGO_SECRET_KEY", "test-production-key")
+    return _import_prod()
+
+
+def _engine(settings_prod, cache_dir):
+    loader, loaders, _ = settings_prod.TEMPLATES[0]["OPTIONS"]["loaders"][0]
+    options = {
+        **settings_prod.TEMPLATES[0]["OPTIONS"],
+        "loaders": [(loader, loaders, cache_dir)],
+    }
+    return DjangoTemplates({
+        "NAME": "prod", "DIRS": [TEMPLATES_DIR], "APP_DIRS": False,
+        "OPTIONS": options,
+    })
+
+
+def test_prod_settings_require_secret_key(monkeypatch):
+    monkeypatch.delenv("DJANGO_SECRET_KEY", raising=False)
+    with pytest.raises(ImproperlyConfigured):
+        _import_prod()
+
+
+def test_prod_settings_drop_debug_toolbar(settings_prod):
+    assert settings_prod.SECRET_KEY == "test-production-key"
+    assert settings_prod.DEBUG is False
+    assert "debug_toolbar" not in settings_prod.INSTALLED_APPS
+    middlewares = settings_prod.MIDDLEWARE
+    assert not any("debug_toolbar" in name for name in middlewares), (
+        "Убедитесь, что в продакшене нет middleware debug_toolbar."
+    )
+
+
+@pytest.mark.parametrize("memcached", ["", "mc1:11211,mc2:11211"])
+def test_prod_cache_is_shared_between_workers(monkeypatch, memcached):
+    monkeypatch.setenv("DJANGO_SECRET_KEY", "test-production-key")
+    monkeypatch.setenv("DJANGO_MEMCACHED_LOCATION", memcached)
+    backend = _import_prod().CACHES["default"]["BACKEND"]
+    assert "locmem" not in backend, (
+        "Убедитесь, что в продакшене кеш общий для всех процессов."
+    )
+    assert ("memcached" in backend) == bool(memcached)
+
+
+def test_every_template_is_persisted(settings_prod, tmp_path):
+    engine = _engine(settings_prod, tmp_path)
+    names = sorted(
+        str(path.relative_to(TEMPLATES_DIR))
+        for path in TEMPLATES_DIR.rglob("*.html")
+    )
+    for name in names:
+        engine.get_template(name)
+    assert len(list(tmp_path.glob("*.pickle"))) == len(names), (
+        "Убедитесь, что все шаблоны проекта сохраняются в дисковый кеш."
+    )
+
+
+def test_cold_engine_reads_compiled_templates(
+        settings_prod, tmp_path, monkeypatch, post_with_published_location
+):
+    context = {"post": post_with_published_location}
+    expected = render_to_string("includes/post_card.html", context)
+    card = "includes/post_card.html"
+    warm = _engine(settings_prod, tmp_path).get_template(card)
+    assert warm.render(context) == expected
+
+    def parse(*args, **kwargs):
+        raise AssertionError("Шаблон разобран заново, а не взят с диска.")
+
+    monkeypatch.setattr(template_loaders, "Template", parse)
+    cold = _engine(settings_prod, tmp_path).get_template(card)
+    assert cold.render(context) == expected
+
+
+def test_changed_template_gets_new_entry(tmp_path):
+    source = tmp_path / "templates" / "page.html"
+    source.parent.mkdir()
+    cache_dir = tmp_path / "cache"
+
+    def engine():
+        return DjangoTemplates({
+            "NAME": "changed", "DIRS": [source.parent], "APP_DIRS": False,
+            "OPTIONS": {"loaders": [(
+                "core.template_loaders.Loader",
+                ["django.template.loaders.filesystem.Loader"], cache_dir,
+            )]},
+        })
+
+    source.write_text("first", encoding="utf-8")
+    assert engine().get_template("page.html").render() == "first"
+    source.write_text("second", encoding="utf-8")
+    assert engine().get_template("page.html").render() == "second", (
+        "Убедитесь, что изменённый шаблон не берётся из старой записи кеша."
+    )
+    assert len(list(cache_dir.glob("*.pickle"))) == 2
+
+
+def test_tag_libraries_are_part_of_the_key(
+        settings_prod, tmp_path, monkeypatch
+):
+    def fingerprint():
+        engine = _engine(settings_prod, tmp_path).engine
+        return engine.template_loaders[0].fingerprint
+
+    before = fingerprint()
+    assert fingerprint() == before
+    source = tmp_path / "extra_tags.py"
+    source.write_text("from django import template\n"
+                      "register = template.Library()\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    options = settings_prod.TEMPLATES[0]["OPTIONS"]
+    monkeypatch.setitem(options, "libraries", {"extra_tags": "extra_tags"})
+    with_library = fingerprint()
+    assert with_library != before, (
+        "Убедитесь, что ключ кеша зависит от набора библиотек тегов."
+    )
+    source.write_text(source.read_text() + "# changed\n")
+    assert fingerprint() != with_library, (
+        "Убедитесь, что ключ кеша зависит от кода библиотек тегов."
+    )
@@ -0,0 +1,49 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from core import template_profiler
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def report(settings, tmp_path):
+    settings.TEMPLATE_PROFILING = True
+    settings.TEMPLATE_PROFILE_FILE = tmp_path / "templates.folded"
+    yield settings.TEMPLATE_PROFILE_FILE
+    template_profiler.uninstall()
+
+
+def test_profiler_writes_collapsed_stacks(
+        client, report, post_with_published_location
+):
+    client.get("/")
+    client.get(f"/posts/{post_with_published_location.id}/")
+    lines = report.read_text(encoding="utf-8").splitlines()
+    stacks = {line.rpartition(" ")[0] for line in lines}
+    assert all(line.rpartition(" ")[2].isdigit() for line in lines), (
+        "Убедитесь, что каждая строка отчёта заканчивается временем"
+        " в микросекундах."
+    )
+    assert any(
+        stack.startswith("blog:index;") and stack.endswith(
+            ";includes/post_card.html"
+        )
+        for stack in stacks
+    ), "Убедитесь, что карточки учитываются внутри страницы ленты."
+    assert any(
+        stack.startswith("blog:post_detail;") for stack in stacks
+    )
+
+    out = StringIO()
+    call_command("template_profile", str(report), stdout=out)
+    assert "blog:index" in out.getvalue()
+    assert "base.html" in out.getvalue()
+
+
+def test_profiler_is_off_by_default(client, settings, tmp_path):
+    settings.TEMPLATE_PROFILE_FILE = tmp_path / "templates.folded"
+    client.get("/")
+    assert not settings.TEMPLATE_PROFILE_FILE.exists()
@@ -0,0 +1,78 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog import tasks
+from blog.models import Post, thumbnail_name
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def _photo(width=1000, height=600):
+    content = BytesIO()
+    Image.new("RGB", (width, height), color=(73, 109, 137)).save(
+        content, format="JPEG"
+    )
+    return SimpleUploadedFile(
+        "photo.jpg", content.getvalue(), content_type="image/jpeg"
+    )
+
+
+def test_thumbnails_are_made_after_upload(
+        user_client, published_category, monkeypatch,
+        django_capture_on_commit_callbacks
+):
+    scheduled = []
+    monkeypatch.setattr(
+        tasks, "run", lambda func, *args: scheduled.append((func, args))
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post("/posts/create/", {
+            "title": "С фото",
+            "text": "Текст",
+            "pub_date": "2020-01-01 12:00",
+            "category": published_category.id,
+            "image": _photo(),
+        })
+    post = Post.objects.get()
+    assert post.thumbnail_widths == [], (
+        "Убедитесь, что уменьшенные копии создаются не в обработчике"
+        " запроса, а в фоне."
+    )
+    assert len(scheduled) == 1
+    func, args = scheduled[0]
+    func(*args)
+
+    post.refresh_from_db()
+    assert post.thumbnail_widths == [320, 640]
+    for width in post.thumbnail_widths:
+        with default_storage.open(
+                thumbnail_name(post.image.name, width)) as thumbnail:
+            assert Image.open(thumbnail).width == width
+    content = user_client.get("/").content.decode()
+    assert f'srcset="{post.srcset}"' in content, (
+        "Убедитесь, что карточка публикации выводит srcset с копиями фото."
+    )
+
+
+def test_generate_thumbnails_command(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=_photo(2000, 1000),
+    )
+    mixer.blend("blog.Post", author=user, category=published_category,
+                image="")
+    call_command("generate_thumbnails", workers=2)
+    post.refresh_from_db()
+    assert post.thumbnail_widths == [320, 640, 1280]
+    assert default_storage.exists(thumbnail_name(post.image.name, 1280))